@@ -3,12 +3,30 @@ from flask import Flask
 from config import Config
 from src.extensions import init_extensions
 from src.utils.errors import register_error_handlers
+from src.utils.serialization import ORJSONProvider, orjson
+from src.routes.auth import bp as auth_bp
+from src.routes.documents import bp as documents_bp
+from src.routes.analysis import bp as analysis_bp
+from src.routes.reports import bp as reports_bp
+from src.routes.factcheck import factcheck_bp
+from src.routes.citations import citations_bp
+from src.routes.simple_analyze import simple_analyze_bp
+from src.routes.protected_analyze import protected_analyze_bp
+from src.routes.results import results_bp
 
 def create_app(config_class=Config):
     """Flask application factory."""
     app = Flask(__name__)
     app.config.from_object(config_class)
     
+    # SQLite has no server connections to pool and rejects the sizing options
+    if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {}
+    
+    # Use orjson for JSON responses and request parsing when it is installed
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
+    
     # Initialize extensions
     init_extensions(app)
     
@@ -16,16 +34,6 @@ def create_app(config_class=Config):
     register_error_handlers(app)
     
     # Register blueprints
-    from src.routes.auth import bp as auth_bp
-    from src.routes.documents import bp as documents_bp
-    from src.routes.analysis import bp as analysis_bp
-    from src.routes.reports import bp as reports_bp
-    from src.routes.factcheck import factcheck_bp
-    from src.routes.citations import citations_bp
-    from src.routes.simple_analyze import simple_analyze_bp
-    from src.routes.protected_analyze import protected_analyze_bp
-    from src.routes.results import results_bp
-    
     app.register_blueprint(auth_bp)
     app.register_blueprint(documents_bp)
     app.register_blueprint(analysis_bp)
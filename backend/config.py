@@ -9,6 +9,16 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('SQLALCHEMY_DATABASE_URI') or 'sqlite:///instance/app.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Database connection pool (server databases only; SQLite keeps the defaults)
+    # Keep workers x (pool size + overflow) below the server's max_connections
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 5)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),  # Before idle connections are dropped
+        'pool_pre_ping': True
+    }
+    
     # Upload settings
     UPLOAD_DIR = os.environ.get('UPLOAD_DIR') or 'uploads'
     REPORT_DIR = os.environ.get('REPORT_DIR') or 'reports'
@@ -20,6 +30,7 @@ class Config:
     # API settings
     SEMANTIC_SCHOLAR_BASE = os.environ.get('SEMANTIC_SCHOLAR_BASE', 'https://api.semanticscholar.org/graph/v1/paper/search')
     SEMANTIC_SCHOLAR_FIELDS = os.environ.get('SEMANTIC_SCHOLAR_FIELDS', 'title,authors,year,venue')
+    SEMANTIC_SCHOLAR_BATCH_URL = os.environ.get('SEMANTIC_SCHOLAR_BATCH_URL', 'https://api.semanticscholar.org/graph/v1/paper/batch')
     
     # Google Fact Check API
     GOOGLE_FACT_CHECK_API_KEY = os.environ.get('GOOGLE_FACT_CHECK_API_KEY')
@@ -29,8 +40,13 @@ class Config:
     CROSSREF_API_URL = 'https://api.crossref.org/works'
     
     # HuggingFace settings
-    HF_MODEL_NAME = os.environ.get('HF_MODEL_NAME', 'facebook/bart-large-cnn')
+    HF_MODEL_NAME = os.environ.get('HF_MODEL_NAME', 'sshleifer/distilbart-cnn-12-6')
     HF_CACHE_DIR = os.environ.get('HF_CACHE_DIR', './models_cache')
+    HF_QUANTIZE_CPU = os.environ.get('HF_QUANTIZE_CPU', 'true').lower() == 'true'
+    HF_USE_ONNX = os.environ.get('HF_USE_ONNX', 'false').lower() == 'true'
+    HF_EXTRACTIVE_MAX_WORDS = int(os.environ.get('HF_EXTRACTIVE_MAX_WORDS', 800))
+    HF_NUM_BEAMS = int(os.environ.get('HF_NUM_BEAMS', 2))
+    HF_BATCH_SIZE = int(os.environ.get('HF_BATCH_SIZE', 4))
     
     # Feature flags
     USE_HF_SUMMARIZER = os.environ.get('USE_HF_SUMMARIZER', 'true').lower() == 'true'
@@ -0,0 +1,54 @@
+"""
+Gunicorn configuration for the backend.
+
+Usage (from the backend directory):
+    gunicorn -c gunicorn_conf.py
+
+Each worker process serves requests on a pool of threads, so requests that
+are waiting on the citation/fact-check APIs don't block each other. The app
+(and, when enabled, the summarization model) is loaded once in the master
+before forking so workers share the model weights copy-on-write. The model
+preload is CPU-only: CUDA can't be used in a forked child once the parent
+has initialized it, so on a GPU host each worker loads the model lazily on
+first use instead.
+"""
+import os
+import logging
+
+wsgi_app = "app:create_app()"
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+
+worker_class = "gthread"
+workers = int(os.environ.get("GUNICORN_WORKERS", 2))
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+
+# Summarizing a long paper on CPU can take well over the default 30s
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+
+preload_app = True
+
+def when_ready(server):
+    """Load the summarizer in the master so forked workers inherit it (CPU only)."""
+    if os.environ.get("USE_HF_SUMMARIZER", "true").lower() != "true":
+        return
+    
+    # Check for a GPU through NVML so the check itself doesn't initialize CUDA
+    # in the master
+    os.environ.setdefault("PYTORCH_NVML_BASED_CUDA_CHECK", "1")
+    try:
+        import torch
+        if torch.cuda.is_available():
+            logging.info("CUDA available; workers will load the summarizer on first use")
+            return
+    except ImportError:
+        return
+    
+    try:
+        from src.services.summarizer_service import _get_summarizer
+        
+        app = server.app.wsgi()
+        with app.app_context():
+            _get_summarizer()
+    except Exception as e:
+        # Workers fall back to loading the model lazily on first use
+        logging.warning(f"Could not preload summarizer: {e}")
@@ -4,7 +4,7 @@ class Citation(db.Model):
     __tablename__ = 'citations'
     
     id = db.Column(db.Integer, primary_key=True)
-    analysis_id = db.Column(db.Integer, db.ForeignKey('analyses.id'), nullable=False)
+    analysis_id = db.Column(db.Integer, db.ForeignKey('analyses.id'), nullable=False, index=True)
     raw_line = db.Column(db.Text, nullable=False)
     cleaned_title = db.Column(db.String(500))
     status = db.Column(db.String(50), nullable=False)  # Valid, Not Found, Timeout, Error
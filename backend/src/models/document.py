@@ -1,21 +1,50 @@
+import zlib
 from datetime import datetime
+from sqlalchemy.orm import deferred
 from src.extensions import db
 
 class Document(db.Model):
     __tablename__ = 'documents'
+    __table_args__ = (
+        # Serves per-user lookups and "my documents, newest first" listings
+        db.Index('ix_documents_user_id_uploaded_at', 'user_id', 'uploaded_at'),
+        # Finds a user's earlier upload of the same file
+        db.Index('ix_documents_user_id_file_hash', 'user_id', 'file_hash'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     filename = db.Column(db.String(255), nullable=False)
     stored_path = db.Column(db.String(500), nullable=False)
     title = db.Column(db.String(500))
-    extracted_text = db.Column(db.Text)  # Store extracted PDF text
+    # Store extracted PDF text zlib-compressed (prose shrinks about 3x); deferred so
+    # listings and ownership checks don't load it (read it through extracted_text)
+    extracted_text_compressed = deferred(db.Column(db.LargeBinary), group='text')
+    # Plain-text column from before compression, kept nullable so upgraded
+    # databases keep their text; read as a fallback when the blob is NULL
+    extracted_text_legacy = deferred(db.Column('extracted_text', db.Text, nullable=True), group='text')
     word_count = db.Column(db.Integer)
+    file_hash = db.Column(db.String(64))  # SHA-256 of the uploaded file
+    # Progress of a ?async=true analysis: 'pending', 'failed' (with the error) or 'completed'
+    analysis_status = db.Column(db.String(20))
+    analysis_error = db.Column(db.Text)
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
     analysis = db.relationship('Analysis', backref='document', uselist=False, cascade='all, delete-orphan')
     
+    @property
+    def extracted_text(self):
+        """Extracted PDF text, decompressed on access."""
+        if self.extracted_text_compressed is None:
+            return self.extracted_text_legacy
+        return zlib.decompress(self.extracted_text_compressed).decode('utf-8')
+    
+    @extracted_text.setter
+    def extracted_text(self, text):
+        self.extracted_text_compressed = zlib.compress(text.encode('utf-8')) if text is not None else None
+        self.extracted_text_legacy = None
+    
     def to_dict(self, include_text=False):
         """Convert document to dictionary."""
         data = {
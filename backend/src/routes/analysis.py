@@ -1,22 +1,31 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from marshmallow import Schema, fields, ValidationError
+from sqlalchemy import insert
 from src.extensions import db
 from src.models.document import Document
 from src.models.analysis import Analysis
 from src.models.citation import Citation
 from src.utils.security import get_current_user, check_document_ownership, check_analysis_ownership
+from src.utils.concurrency import submit_with_app_context
 from src.services.pdf_service import extract_text_and_meta
 from src.services.summarizer_service import summarize
 from src.services.plagiarism_service import check as check_plagiarism
 from src.services.citations_service import validate as validate_citations
 from src.services.critique_service import critique
 
+logger = logging.getLogger(__name__)
+
 bp = Blueprint('analysis', __name__, url_prefix='/analysis')
 
 class RunAnalysisSchema(Schema):
     document_id = fields.Int(required=True)
 
+# Schemas hold no per-request state, so one instance serves every request
+run_analysis_schema = RunAnalysisSchema()
+
 @bp.route('/run', methods=['POST'])
 @jwt_required()
 def run_analysis():
@@ -25,10 +34,8 @@ def run_analysis():
     if not current_user:
         return jsonify({'message': 'User not found'}), 404
     
-    schema = RunAnalysisSchema()
-    
     try:
-        data = schema.load(request.get_json())
+        data = run_analysis_schema.load(request.get_json())
     except ValidationError as err:
         return jsonify({'message': 'Validation error', 'errors': err.messages}), 400
     
@@ -46,30 +53,37 @@ def run_analysis():
         return jsonify({'message': 'Analysis already exists for this document'}), 409
     
     try:
-        # Extract text from document
-        text, word_count, title = extract_text_and_meta(document.stored_path)
+        # Reuse the text extracted at upload; documents uploaded before it
+        # was stored are extracted from the PDF again
+        text = document.extracted_text
+        if text is None:
+            text, word_count, title = extract_text_and_meta(document.stored_path)
         
         if not text or len(text.strip()) < 100:
             return jsonify({'message': 'Document text too short for analysis'}), 400
         
         # Run analysis pipeline
-        print(f"Starting analysis for document {document.id}")
-        
-        # 1. Summarization
-        print("Running summarization...")
-        summary = summarize(text)
+        logger.info("Starting analysis for document %s", document.id)
         
-        # 2. Plagiarism detection
-        print("Running plagiarism check...")
-        plagiarism_score = check_plagiarism(text)
+        # Lowercase once; plagiarism and critique both scan the lowercased text
+        text_lower = text.lower()
         
-        # 3. Citation validation
-        print("Validating citations...")
-        citation_results = validate_citations(text)
+        # Summarization, plagiarism detection and citation validation are
+        # independent, so run them concurrently (model inference overlaps
+        # with the citation API round-trips)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            logger.info("Running summarization, plagiarism check and citation validation...")
+            summary_future = submit_with_app_context(executor, summarize, text)
+            plagiarism_future = submit_with_app_context(executor, check_plagiarism, text, text_lower)
+            citations_future = submit_with_app_context(executor, validate_citations, text)
+            
+            summary = summary_future.result()
+            plagiarism_score = plagiarism_future.result()
+            citation_results = citations_future.result()
         
-        # 4. Critique analysis
-        print("Running critique analysis...")
-        critique_results = critique(text, summary)
+        # Critique analysis (needs the summary)
+        logger.info("Running critique analysis...")
+        critique_results = critique(text, summary, text_lower)
         
         # Create analysis record
         analysis = Analysis(
@@ -82,19 +96,21 @@ def run_analysis():
         db.session.add(analysis)
         db.session.flush()  # Get analysis ID
         
-        # Save citations
-        for citation_data in citation_results:
-            citation = Citation(
-                analysis_id=analysis.id,
-                raw_line=citation_data['raw'],
-                cleaned_title=citation_data['cleaned_title'],
-                status=citation_data['status']
-            )
-            db.session.add(citation)
+        # Save citations in one multi-row INSERT
+        if citation_results:
+            db.session.execute(insert(Citation), [
+                {
+                    'analysis_id': analysis.id,
+                    'raw_line': citation_data['raw'],
+                    'cleaned_title': citation_data['cleaned_title'],
+                    'status': citation_data['status']
+                }
+                for citation_data in citation_results
+            ])
         
         db.session.commit()
         
-        print(f"Analysis completed for document {document.id}")
+        logger.info("Analysis completed for document %s", document.id)
         
         # Return results
         return jsonify({
@@ -107,7 +123,7 @@ def run_analysis():
         
     except Exception as e:
         db.session.rollback()
-        print(f"Analysis failed for document {document.id}: {str(e)}")
+        logger.error("Analysis failed for document %s: %s", document.id, e)
         return jsonify({'message': f'Analysis failed: {str(e)}'}), 500
 
 @bp.route('/<int:analysis_id>', methods=['GET'])
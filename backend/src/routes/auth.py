@@ -16,13 +16,15 @@ class LoginSchema(Schema):
     email = fields.Email(required=True)
     password = fields.Str(required=True)
 
+# Schemas hold no per-request state, so one instance serves every request
+register_schema = RegisterSchema()
+login_schema = LoginSchema()
+
 @bp.route('/register', methods=['POST'])
 def register():
     """Register a new user."""
-    schema = RegisterSchema()
-    
     try:
-        data = schema.load(request.get_json())
+        data = register_schema.load(request.get_json())
     except ValidationError as err:
         return jsonify({'message': 'Validation error', 'errors': err.messages}), 400
     
@@ -56,10 +58,8 @@ def register():
 @bp.route('/login', methods=['POST'])
 def login():
     """Login user and return JWT tokens."""
-    schema = LoginSchema()
-    
     try:
-        data = schema.load(request.get_json())
+        data = login_schema.load(request.get_json())
     except ValidationError as err:
         return jsonify({'message': 'Validation error', 'errors': err.messages}), 400
     
@@ -4,7 +4,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from src.extensions import db
 from src.models.user import User
 from src.models.document import Document
-from src.utils.validators import validate_upload_request, generate_safe_filename
+from src.utils.validators import validate_upload_request, generate_safe_filename, UPLOAD_BUFFER_SIZE
 from src.utils.security import get_current_user, check_document_ownership
 from src.services.pdf_service import extract_text_and_meta
 
@@ -34,7 +34,7 @@ def upload_document():
         os.makedirs(upload_dir, exist_ok=True)
         
         file_path = os.path.join(upload_dir, safe_filename)
-        file.save(file_path)
+        file.save(file_path, buffer_size=UPLOAD_BUFFER_SIZE)
         
         # Extract text and metadata
         text, word_count, title = extract_text_and_meta(file_path)
@@ -45,6 +45,7 @@ def upload_document():
             filename=file.filename,
             stored_path=file_path,
             title=title,
+            extracted_text=text,
             word_count=word_count
         )
         
@@ -1,4 +1,6 @@
 from flask import Blueprint, request, jsonify
+from sqlalchemy.orm import load_only
+from src.extensions import db
 from src.services.factcheck_service import extract_claims, fact_check_claims
 from src.services.pdf_service import extract_text_and_meta
 from src.models.document import Document
@@ -49,8 +51,12 @@ def run_factcheck():
                     "data": None
                 }), 400
             
-            # Find document in database
-            document = Document.query.get(doc_id)
+            # Find document in database; only its text (or file path) is needed
+            document = db.session.get(
+                Document, doc_id,
+                options=[load_only(Document.stored_path, Document.extracted_text_compressed,
+                                   Document.extracted_text_legacy)]
+            )
             if not document:
                 return jsonify({
                     "status": "error",
@@ -59,8 +65,11 @@ def run_factcheck():
                 }), 404
             
             try:
-                # Extract text from stored PDF file
-                text, word_count, title = extract_text_and_meta(document.stored_path)
+                # Reuse the text extracted at upload; documents uploaded
+                # before it was stored are extracted from the PDF again
+                text = document.extracted_text
+                if text is None:
+                    text, word_count, title = extract_text_and_meta(document.stored_path)
                 
                 if not text or len(text.strip()) < 50:
                     return jsonify({
@@ -1,8 +1,10 @@
-from flask import Blueprint, request, jsonify
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, request, jsonify, url_for, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 import os
-import tempfile
+import hashlib
 import logging
+from sqlalchemy import insert, select
 from src.extensions import db
 from src.models.user import User
 from src.models.document import Document
@@ -14,10 +16,18 @@ from src.services.pdf_service import extract_text_and_meta
 from src.services.summarizer_service import summarize
 from src.services.plagiarism_service import check_plagiarism, check
 from src.services.citations_service import validate as validate_citations
-from src.services.factcheck_service import extract_claims, fact_check_claims
+from src.services.factcheck_service import fact_check_text
+from src.utils.concurrency import submit_with_app_context
+from src.utils.formatting import format_citations, format_facts
+from src.utils.security import get_current_user, check_document_ownership
+from src.utils.validators import generate_safe_filename
 
 logger = logging.getLogger(__name__)
 
+# Runs ?async=true analyses after the upload request has returned
+ANALYZE_JOB_WORKERS = int(os.getenv("ANALYZE_JOB_WORKERS", "2"))
+_job_executor = ThreadPoolExecutor(max_workers=ANALYZE_JOB_WORKERS, thread_name_prefix="analysis-job")
+
 # Create blueprint for protected analysis (requires authentication)
 protected_analyze_bp = Blueprint('protected_analyze', __name__, url_prefix='/api/analyze')
 
@@ -38,6 +48,9 @@ def analyze_and_save():
         401: Authentication required
         500: Server error
     """
+    stored_path = None
+    document_saved = False
+    
     try:
         current_user_id = get_jwt_identity()
         current_user = User.query.get(current_user_id)
@@ -58,156 +71,289 @@ def analyze_and_save():
         if not file.filename.lower().endswith('.pdf'):
             return jsonify({'error': 'Only PDF files are allowed'}), 400
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            file.save(temp_file.name)
-            temp_path = temp_file.name
+        # Read the upload once: it is hashed, parsed from memory and, for new
+        # documents, written out once
+        data = file.read()
+        file_hash = hashlib.sha256(data).hexdigest()
         
-        try:
-            # Extract text and metadata
-            text, word_count, title = extract_text_and_meta(temp_path)
-            
-            if not text or len(text.strip()) < 100:
-                return jsonify({'error': 'Document text too short for analysis'}), 400
+        # Re-uploads of the same file (e.g. UI retries) return the saved
+        # analysis instead of running the pipeline again
+        existing = db.session.scalar(
+            select(Analysis)
+            .join(Document)
+            .where(Document.user_id == current_user_id, Document.file_hash == file_hash)
+            .order_by(Analysis.id.desc())
+            .limit(1)
+        )
+        if existing:
+            logger.info("Returning saved analysis %s for duplicate upload: %s", existing.id, file.filename)
+            citations = [citation.to_dict() for citation in existing.citations]
+            return jsonify(_format_results(existing, existing.document, citations)), 200
+        
+        # Extract text and metadata
+        text, word_count, title = extract_text_and_meta(data)
+        
+        if not text or len(text.strip()) < 100:
+            return jsonify({'error': 'Document text too short for analysis'}), 400
+        
+        # A failed background analysis of the same file is retried on its
+        # existing document instead of saving a second copy
+        document = db.session.scalar(
+            select(Document)
+            .where(
+                Document.user_id == current_user_id,
+                Document.file_hash == file_hash,
+                Document.analysis_status == 'failed'
+            )
+            .order_by(Document.id.desc())
+            .limit(1)
+        )
+        if document:
+            document_saved = True  # Its PDF is already stored
+            document.analysis_status = None
+            document.analysis_error = None
+        else:
+            # Keep the PDF under UPLOAD_DIR so Document.stored_path stays valid;
+            # duplicate and too-short uploads above never reach the disk
+            upload_dir = current_app.config.get('UPLOAD_DIR', 'uploads')
+            os.makedirs(upload_dir, exist_ok=True)
+            stored_path = os.path.join(upload_dir, generate_safe_filename(file.filename))
+            with open(stored_path, 'wb') as stored_file:
+                stored_file.write(data)
             
             # Create document record
             document = Document(
                 user_id=current_user_id,
                 filename=file.filename,
-                stored_path=temp_path,  # In production, move to permanent storage
+                stored_path=stored_path,
                 title=title or file.filename,
                 extracted_text=text,
-                word_count=word_count
+                word_count=word_count,
+                file_hash=file_hash
             )
             
             db.session.add(document)
             db.session.flush()  # Get the document ID
-            
-            # Run analysis pipeline
-            logger.info(f"Starting analysis for user {current_user.email}: {file.filename}")
-            
-            # Initialize default values
-            summary = "Analysis failed to generate summary."
-            plagiarism_result = {"plagiarism_score": 0.0, "matching_sources": []}
-            citation_results = []
-            fact_check_results = []
-            
-            # 1. Summarization
-            logger.info("Running summarization...")
-            try:
-                summary = summarize(text)
-                logger.info("Summarization completed successfully")
-            except Exception as e:
-                logger.error(f"Summarization failed: {e}")
-                summary = "Unable to generate summary due to processing error."
-            
-            # 2. Plagiarism detection
-            logger.info("Running plagiarism check...")
-            try:
-                plagiarism_result = check_plagiarism(text)
-                if isinstance(plagiarism_result, dict):
-                    # New format with details
-                    plagiarism_score = plagiarism_result.get('plagiarism_score', 0.0)
-                else:
-                    # Fallback to simple check function
-                    plagiarism_score = check(text) / 100.0  # Convert percentage to decimal
-                    plagiarism_result = {"plagiarism_score": plagiarism_score, "matching_sources": []}
-                
-                logger.info(f"Plagiarism check completed: {plagiarism_result.get('plagiarism_score', 0)}%")
-            except Exception as e:
-                logger.error(f"Plagiarism check failed: {e}")
-                plagiarism_result = {"plagiarism_score": 0.0, "matching_sources": []}
-            
-            # 3. Citation validation
-            logger.info("Validating citations...")
-            try:
-                citation_results = validate_citations(text)
-                logger.info(f"Citation validation completed: {len(citation_results)} citations found")
-            except Exception as e:
-                logger.error(f"Citation validation failed: {e}")
-                citation_results = []
-            
-            # 4. Fact checking
-            logger.info("Running fact check...")
-            try:
-                claims = extract_claims(text)
-                fact_check_results = fact_check_claims(claims) if claims else []
-                logger.info(f"Fact checking completed: {len(fact_check_results)} claims checked")
-            except Exception as e:
-                logger.error(f"Fact check failed: {e}")
-                fact_check_results = []
-            
-            # Create analysis record
-            analysis = Analysis(
-                document_id=document.id,
-                summary=summary,
-                plagiarism_score=plagiarism_result.get('plagiarism_score', 0.0),
-                plagiarism_details=plagiarism_result.get('matching_sources', []),
-                fact_check_results=fact_check_results
-            )
-            
-            db.session.add(analysis)
-            
-            # Save citation records
-            for citation_data in citation_results:
-                citation = Citation(
-                    analysis_id=analysis.id,
-                    raw_text=citation_data.get('raw', citation_data.get('reference', '')),
-                    cleaned_title=citation_data.get('cleaned_title', ''),
-                    doi=citation_data.get('doi'),
-                    status='verified' if citation_data.get('valid', False) else 'unverified'
-                )
-                db.session.add(citation)
-            
-            # Commit all changes
+        
+        # With ?async=true the pipeline runs on a background thread and
+        # the client polls the status URL instead of holding the request open
+        if request.args.get('async', 'false').lower() == 'true':
+            document.analysis_status = 'pending'
             db.session.commit()
+            document_saved = True
+            submit_with_app_context(_job_executor, _run_pipeline_job, document.id, text)
+            logger.info("Queued analysis for user %s: %s", current_user.email, file.filename)
             
-            logger.info(f"Analysis completed and saved for user {current_user.email}: {file.filename}")
-            
-            # Format response for frontend compatibility
-            formatted_citations = []
-            for citation in citation_results:
-                formatted_citations.append({
-                    "reference": citation.get('raw', citation.get('cleaned_title', 'Unknown citation')),
-                    "valid": citation.get('valid', False)
-                })
-            
-            formatted_facts = []
-            for fact in fact_check_results:
-                formatted_facts.append({
-                    "claim": fact.get('claim', 'Unknown claim'),
-                    "status": "Verified" if fact.get('status') == 'verified' else "Unverified"
-                })
-            
-            # Return results with database IDs
             return jsonify({
-                'analysis_id': analysis.id,
                 'document_id': document.id,
-                'summary': summary,
-                'plagiarism': plagiarism_result.get('plagiarism_score', 0.0),
-                'plagiarism_details': plagiarism_result.get('matching_sources', []),
-                'citations': formatted_citations,
-                'fact_check': {
-                    'facts': formatted_facts
-                },
-                'stats': {
-                    'word_count': word_count,
-                    'plagiarism_percent': plagiarism_result.get('plagiarism_score', 0.0),
-                    'citations_count': len(formatted_citations),
-                    'fact_checks_count': len(formatted_facts)
-                }
-            }), 200
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-                
+                'status': 'pending',
+                'status_url': url_for('protected_analyze.analysis_status', document_id=document.id)
+            }), 202
+        
+        # Run analysis pipeline
+        logger.info("Starting analysis for user %s: %s", current_user.email, file.filename)
+        analysis, citation_results = _run_pipeline(document, text)
+        document_saved = True
+        logger.info("Analysis completed and saved for user %s: %s", current_user.email, file.filename)
+        
+        # Return results with database IDs
+        return jsonify(_format_results(analysis, document, citation_results)), 200
+        
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Analysis failed for user {current_user_id}: {str(e)}")
+        # Don't leave the PDF behind when its document was never saved
+        if stored_path and not document_saved and os.path.exists(stored_path):
+            os.remove(stored_path)
+        logger.error("Analysis failed for user %s: %s", current_user_id, e)
         return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
 
+def _run_pipeline(document, text: str):
+    """
+    Run the analysis stages on a document's text and save the results.
+    
+    Args:
+        document: Document record (already flushed, so it has an ID)
+        text: Extracted document text
+        
+    Returns:
+        Tuple of (saved Analysis, citation validation results)
+    """
+    # Initialize default values
+    summary = "Analysis failed to generate summary."
+    plagiarism_result = {"plagiarism_score": 0.0, "matching_sources": []}
+    citation_results = []
+    fact_check_results = []
+    
+    # The four stages are independent, so run them concurrently; each
+    # one still falls back to its default value if it fails. Database
+    # work stays on this thread.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        logger.info("Running summarization, plagiarism check, citation validation and fact check...")
+        summary_future = submit_with_app_context(executor, summarize, text)
+        plagiarism_future = submit_with_app_context(executor, check_plagiarism, text)
+        citations_future = submit_with_app_context(executor, validate_citations, text)
+        fact_check_future = submit_with_app_context(executor, fact_check_text, text)
+    
+    # 1. Summarization
+    try:
+        summary = summary_future.result()
+        logger.info("Summarization completed successfully")
+    except Exception as e:
+        logger.error("Summarization failed: %s", e)
+        summary = "Unable to generate summary due to processing error."
+    
+    # 2. Plagiarism detection
+    try:
+        plagiarism_result = plagiarism_future.result()
+        if isinstance(plagiarism_result, dict):
+            # New format with details
+            plagiarism_score = plagiarism_result.get('plagiarism_score', 0.0)
+        else:
+            # Fallback to simple check function
+            plagiarism_score = check(text) / 100.0  # Convert percentage to decimal
+            plagiarism_result = {"plagiarism_score": plagiarism_score, "matching_sources": []}
+        
+        logger.info("Plagiarism check completed: %s%%", plagiarism_result.get('plagiarism_score', 0))
+    except Exception as e:
+        logger.error("Plagiarism check failed: %s", e)
+        plagiarism_result = {"plagiarism_score": 0.0, "matching_sources": []}
+    
+    # 3. Citation validation
+    try:
+        citation_results = citations_future.result()
+        logger.info("Citation validation completed: %d citations found", len(citation_results))
+    except Exception as e:
+        logger.error("Citation validation failed: %s", e)
+        citation_results = []
+    
+    # 4. Fact checking
+    try:
+        fact_check_results = fact_check_future.result()
+        logger.info("Fact checking completed: %d claims checked", len(fact_check_results))
+    except Exception as e:
+        logger.error("Fact check failed: %s", e)
+        fact_check_results = []
+    
+    # Create analysis record
+    analysis = Analysis(
+        document_id=document.id,
+        summary=summary,
+        plagiarism_score=plagiarism_result.get('plagiarism_score', 0.0),
+        plagiarism_details=plagiarism_result.get('matching_sources', []),
+        fact_check_results=fact_check_results
+    )
+    
+    db.session.add(analysis)
+    document.analysis_status = 'completed'
+    db.session.flush()  # Get analysis ID
+    
+    # Save citation records in one multi-row INSERT
+    if citation_results:
+        db.session.execute(insert(Citation), [
+            {
+                'analysis_id': analysis.id,
+                'raw_line': citation_data['raw'],
+                'cleaned_title': citation_data['cleaned_title'],
+                'status': citation_data['status']
+            }
+            for citation_data in citation_results
+        ])
+    
+    db.session.commit()
+    
+    return analysis, citation_results
+
+def _run_pipeline_job(document_id: int, text: str) -> None:
+    """Background entry point for ?async=true uploads."""
+    try:
+        document = db.session.get(Document, document_id)
+        _run_pipeline(document, text)
+        logger.info("Background analysis completed for document %s", document_id)
+    except Exception as e:
+        db.session.rollback()
+        logger.error("Background analysis failed for document %s: %s", document_id, e)
+        _record_job_failure(document_id, str(e))
+
+def _record_job_failure(document_id: int, error: str) -> None:
+    """Mark a background analysis as failed so /status reports it."""
+    try:
+        document = db.session.get(Document, document_id)
+        if document:
+            document.analysis_status = 'failed'
+            document.analysis_error = error
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error("Could not record the failed analysis of document %s: %s", document_id, e)
+
+def _format_results(analysis, document, citations) -> dict:
+    """
+    Format a saved analysis for the frontend.
+    
+    Args:
+        analysis: Saved Analysis record
+        document: Document the analysis belongs to
+        citations: Citation dicts with raw, cleaned_title and status fields
+        
+    Returns:
+        Response payload with database IDs
+    """
+    formatted_citations = format_citations(citations)
+    formatted_facts = format_facts(analysis.fact_check_results or [])
+    
+    plagiarism_score = analysis.plagiarism_score or 0.0
+    
+    return {
+        'analysis_id': analysis.id,
+        'document_id': document.id,
+        'summary': analysis.summary,
+        'plagiarism': plagiarism_score,
+        'plagiarism_details': analysis.plagiarism_details or [],
+        'citations': formatted_citations,
+        'fact_check': {
+            'facts': formatted_facts
+        },
+        'stats': {
+            'word_count': document.word_count,
+            'plagiarism_percent': plagiarism_score,
+            'citations_count': len(formatted_citations),
+            'fact_checks_count': len(formatted_facts)
+        }
+    }
+
+@protected_analyze_bp.route('/<int:document_id>/status', methods=['GET'])
+@jwt_required()
+def analysis_status(document_id):
+    """
+    Report the progress of an analysis started with ?async=true.
+    
+    GET /api/analyze/<document_id>/status
+    
+    Returns:
+        200: {"status": "pending"|"failed"} or {"status": "completed", ...analysis results}
+        403: Access denied
+        404: Document not found
+    """
+    current_user = get_current_user()
+    if not current_user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    document = db.session.get(Document, document_id)
+    if not document:
+        return jsonify({'error': 'Document not found'}), 404
+    
+    if not check_document_ownership(document, current_user.id) and current_user.role != 'admin':
+        return jsonify({'error': 'Access denied'}), 403
+    
+    if document.analysis:
+        citations = [citation.to_dict() for citation in document.analysis.citations]
+        return jsonify({'status': 'completed', **_format_results(document.analysis, document, citations)}), 200
+    
+    if document.analysis_status == 'failed':
+        return jsonify({'status': 'failed', 'error': document.analysis_error}), 200
+    
+    return jsonify({'status': 'pending', 'document_id': document_id}), 200
+
 @protected_analyze_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
@@ -1,6 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
 from flask import Blueprint, request, jsonify
-import os
-import tempfile
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,7 +9,9 @@ from src.services.pdf_service import extract_text_and_meta
 from src.services.summarizer_service import summarize
 from src.services.plagiarism_service import check as check_plagiarism
 from src.services.citations_service import validate as validate_citations
-from src.services.factcheck_service import extract_claims, fact_check_claims
+from src.services.factcheck_service import fact_check_text
+from src.utils.concurrency import submit_with_app_context
+from src.utils.formatting import format_citations, format_facts
 
 # Create blueprint for simple analysis (no auth required)
 simple_analyze_bp = Blueprint('simple_analyze', __name__)
@@ -44,109 +45,85 @@ def analyze_document():
         if not file.filename.lower().endswith('.pdf'):
             return jsonify({'error': 'Only PDF files are allowed'}), 400
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            file.save(temp_file.name)
-            temp_path = temp_file.name
+        # Parse the upload straight from memory; it never needs to hit the disk
+        text, word_count, title = extract_text_and_meta(file.read())
         
+        if not text or len(text.strip()) < 100:
+            return jsonify({'error': 'Document text too short for analysis'}), 400
+        
+        # Run analysis pipeline
+        logger.info("Starting analysis for file: %s", file.filename)
+        
+        # Initialize default values
+        summary = "Analysis failed to generate summary."
+        plagiarism_score = 0.0
+        citation_results = []
+        fact_check_results = []
+        
+        # The four stages are independent, so run them concurrently; each
+        # one still falls back to its default value if it fails
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            logger.info("Running summarization, plagiarism check, citation validation and fact check...")
+            summary_future = submit_with_app_context(executor, summarize, text)
+            plagiarism_future = submit_with_app_context(executor, check_plagiarism, text)
+            citations_future = submit_with_app_context(executor, validate_citations, text)
+            fact_check_future = submit_with_app_context(executor, fact_check_text, text)
+        
+        # 1. Summarization
         try:
-            # Extract text and metadata
-            text, word_count, title = extract_text_and_meta(temp_path)
-            
-            if not text or len(text.strip()) < 100:
-                return jsonify({'error': 'Document text too short for analysis'}), 400
-            
-            # Run analysis pipeline
-            print(f"Starting analysis for uploaded file: {file.filename}")
-            logger.info(f"Starting analysis for file: {file.filename}")
-            
-            # Initialize default values
-            summary = "Analysis failed to generate summary."
+            summary = summary_future.result()
+            logger.info("Summarization completed successfully")
+        except Exception as e:
+            logger.error("Summarization failed: %s", e)
+            summary = "Unable to generate summary due to processing error."
+        
+        # 2. Plagiarism detection
+        try:
+            plagiarism_score = plagiarism_future.result()
+            logger.info("Plagiarism check completed: %s%%", plagiarism_score)
+        except Exception as e:
+            logger.error("Plagiarism check failed: %s", e)
             plagiarism_score = 0.0
+        
+        # 3. Citation validation
+        try:
+            citation_results = citations_future.result()
+            logger.info("Citation validation completed: %d citations found", len(citation_results))
+        except Exception as e:
+            logger.error("Citation validation failed: %s", e)
             citation_results = []
+        
+        # 4. Fact checking
+        try:
+            fact_check_results = fact_check_future.result()
+            logger.info("Fact checking completed: %d claims checked", len(fact_check_results))
+        except Exception as e:
+            logger.error("Fact check failed: %s", e)
             fact_check_results = []
-            
-            # 1. Summarization
-            print("Running summarization...")
-            try:
-                summary = summarize(text)
-                logger.info("Summarization completed successfully")
-            except Exception as e:
-                print(f"Summarization failed: {e}")
-                logger.error(f"Summarization failed: {e}")
-                summary = "Unable to generate summary due to processing error."
-            
-            # 2. Plagiarism detection
-            print("Running plagiarism check...")
-            try:
-                plagiarism_score = check_plagiarism(text)
-                logger.info(f"Plagiarism check completed: {plagiarism_score}%")
-            except Exception as e:
-                print(f"Plagiarism check failed: {e}")
-                logger.error(f"Plagiarism check failed: {e}")
-                plagiarism_score = 0.0
-            
-            # 3. Citation validation
-            print("Validating citations...")
-            try:
-                citation_results = validate_citations(text)
-                logger.info(f"Citation validation completed: {len(citation_results)} citations found")
-            except Exception as e:
-                print(f"Citation validation failed: {e}")
-                logger.error(f"Citation validation failed: {e}")
-                citation_results = []
-            
-            # 4. Fact checking
-            print("Running fact check...")
-            try:
-                claims = extract_claims(text)
-                fact_check_results = fact_check_claims(claims) if claims else []
-                logger.info(f"Fact checking completed: {len(fact_check_results)} claims checked")
-            except Exception as e:
-                print(f"Fact check failed: {e}")
-                logger.error(f"Fact check failed: {e}")
-                fact_check_results = []
-            
-            print(f"Analysis completed for file: {file.filename}")
-            
-            # Format citations for frontend
-            formatted_citations = []
-            for citation in citation_results:
-                formatted_citations.append({
-                    "reference": citation.get('raw', citation.get('cleaned_title', 'Unknown citation')),
-                    "valid": citation.get('status') == 'verified'
-                })
-            
-            # Format fact check results for frontend
-            formatted_facts = []
-            for fact in fact_check_results:
-                formatted_facts.append({
-                    "claim": fact.get('claim', 'Unknown claim'),
-                    "status": "Verified" if fact.get('status') == 'verified' else "Unverified"
-                })
-            
-            # Return results in the format expected by frontend
-            return jsonify({
-                'summary': summary,
-                'plagiarism': plagiarism_score,
-                'citations': formatted_citations,
-                'fact_check': {
-                    'facts': formatted_facts
-                },
-                'stats': {
-                    'word_count': word_count,
-                    'plagiarism_percent': plagiarism_score,
-                    'citations_count': len(formatted_citations)
-                }
-            }), 200
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+        
+        logger.info("Analysis completed for file: %s", file.filename)
+        
+        # Format results for frontend
+        formatted_citations = format_citations(citation_results)
+        formatted_facts = format_facts(fact_check_results)
+        
+        # Return results in the format expected by frontend
+        return jsonify({
+            'summary': summary,
+            'plagiarism': plagiarism_score,
+            'citations': formatted_citations,
+            'fact_check': {
+                'facts': formatted_facts
+            },
+            'stats': {
+                'word_count': word_count,
+                'plagiarism_percent': plagiarism_score,
+                'citations_count': len(formatted_citations)
+            }
+        }), 200
                 
     except Exception as e:
-        print(f"Analysis failed: {str(e)}")
+        logger.error("Analysis failed: %s", e)
         return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
 
 @simple_analyze_bp.route('/health', methods=['GET'])
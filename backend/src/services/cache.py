@@ -0,0 +1,217 @@
+"""
+Persistent cache for expensive external lookups and model outputs.
+
+Entries are JSON-serialised into Redis when REDIS_URL is set (shared by all
+app instances), otherwise into a local SQLite database so they survive
+process restarts and are shared between worker processes.
+"""
+import os
+import time
+import random
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from src.utils.serialization import dumps, loads
+
+try:
+    import redis
+except ImportError:  # Optional: only needed when REDIS_URL is set
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.getenv("API_CACHE_PATH", os.path.join(".cache", "api_cache.sqlite3"))
+DEFAULT_TTL = int(os.getenv("API_CACHE_TTL", str(7 * 24 * 3600)))  # 7 days
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Entries live up to 10% longer than their TTL, chosen at random, so entries
+# written together don't all expire (and get recomputed) at the same moment
+TTL_JITTER = 0.1
+
+# Expired SQLite rows are deleted by a write at most this often (seconds)
+PRUNE_INTERVAL = 3600
+
+# Idle SQLite connections kept for reuse; requests run on short-lived executor
+# threads, so connections are checked out per operation instead of per thread
+MAX_IDLE_CONNECTIONS = 8
+
+_pool = []
+_pool_pid = None
+_pool_lock = threading.Lock()
+_schema_ready = False
+_last_prune = 0.0
+
+_redis_client = None
+if REDIS_URL:
+    if redis is None:
+        logger.warning("REDIS_URL is set but the redis package is not installed; using SQLite cache")
+    else:
+        # The client keeps a thread-safe connection pool
+        _redis_client = redis.Redis.from_url(REDIS_URL)
+
+# Backend errors are logged and treated as a miss / skipped write
+_BACKEND_ERRORS = (sqlite3.Error,) + ((redis.RedisError,) if redis is not None else ())
+
+
+def _open_connection() -> sqlite3.Connection:
+    """Open a connection to the cache database, creating the schema on first use in this process."""
+    global _schema_ready
+    
+    cache_dir = os.path.dirname(CACHE_PATH)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # Connections move between threads through the pool, but only one thread
+    # uses a connection at a time
+    conn = sqlite3.connect(CACHE_PATH, timeout=5, check_same_thread=False)
+    if not _schema_ready:
+        conn.execute("PRAGMA journal_mode=WAL")  # Stored in the database file
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_expires_at ON cache (expires_at)")
+        conn.commit()
+        _schema_ready = True
+    return conn
+
+
+@contextmanager
+def _connection():
+    """Check out a pooled connection to the cache database for one operation."""
+    global _pool, _pool_pid
+    
+    with _pool_lock:
+        # Connections inherited from a parent process (e.g. the gunicorn
+        # master) must not be used after fork
+        if _pool_pid != os.getpid():
+            _pool, _pool_pid = [], os.getpid()
+        conn = _pool.pop() if _pool else None
+    
+    if conn is None:
+        conn = _open_connection()
+    
+    try:
+        yield conn
+    finally:
+        with _pool_lock:
+            if _pool_pid == os.getpid() and len(_pool) < MAX_IDLE_CONNECTIONS:
+                _pool.append(conn)
+                conn = None
+        if conn is not None:
+            conn.close()
+
+
+def make_key(*parts) -> str:
+    """
+    Build a compact, fixed-length cache key from arbitrary parts.
+
+    Args:
+        *parts: Values identifying the cached item (converted with str())
+
+    Returns:
+        Hex digest suitable for use as a cache key
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def cache_get(namespace: str, key: str):
+    """
+    Look up a cached value.
+
+    Args:
+        namespace: Logical group of the entry (e.g. "http", "summary")
+        key: Entry key within the namespace
+
+    Returns:
+        The cached value, or None on a miss, expiry, or cache error
+    """
+    try:
+        if _redis_client is not None:
+            value = _redis_client.get(f"{namespace}:{key}")
+            return loads(value) if value is not None else None
+        
+        with _connection() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?",
+                (f"{namespace}:{key}",)
+            ).fetchone()
+    except _BACKEND_ERRORS as e:
+        logger.warning(f"Cache read failed: {e}")
+        return None
+
+    if row is None or row[1] < time.time():
+        return None
+    return loads(row[0])
+
+
+def cache_set(namespace: str, key: str, value, ttl: int = DEFAULT_TTL) -> None:
+    """
+    Store a JSON-serialisable value in the cache.
+
+    Args:
+        namespace: Logical group of the entry (e.g. "http", "summary")
+        key: Entry key within the namespace
+        value: JSON-serialisable value to store
+        ttl: Time to live in seconds (extended by a random jitter of up to 10%)
+    """
+    ttl = int(ttl * (1 + random.uniform(0, TTL_JITTER)))
+    
+    try:
+        if _redis_client is not None:
+            _redis_client.setex(f"{namespace}:{key}", ttl, dumps(value))
+            return
+        
+        now = time.time()
+        with _connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (f"{namespace}:{key}", dumps(value), now + ttl)
+            )
+            
+            # Expired rows are skipped on read; delete them now and then so
+            # the database doesn't grow without bound
+            if _should_prune(now):
+                conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+            conn.commit()
+    except _BACKEND_ERRORS + (TypeError, ValueError) as e:
+        logger.warning(f"Cache write failed: {e}")
+
+
+def _should_prune(now: float) -> bool:
+    """Return True (at most once per PRUNE_INTERVAL per process) when expired rows should be deleted."""
+    global _last_prune
+    
+    with _pool_lock:
+        if now - _last_prune < PRUNE_INTERVAL:
+            return False
+        _last_prune = now
+        return True
+
+
+def get_or_set(namespace: str, key: str, producer, ttl: int = DEFAULT_TTL):
+    """
+    Return a cached value, computing and caching it on a miss (cache-aside).
+
+    Args:
+        namespace: Logical group of the entry (e.g. "http", "summary")
+        key: Entry key within the namespace
+        producer: Zero-argument callable that computes the value
+        ttl: Time to live in seconds
+
+    Returns:
+        The cached or freshly computed value. Exceptions raised by producer
+        propagate and nothing is cached; None results are not cached either.
+    """
+    value = cache_get(namespace, key)
+    if value is None:
+        value = producer()
+        if value is not None:
+            cache_set(namespace, key, value, ttl)
+    return value
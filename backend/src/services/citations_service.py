@@ -2,10 +2,17 @@ import re
 import requests
 import logging
 import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from flask import current_app
-from urllib.parse import quote
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
+from src.services.cache import cache_get, cache_set, get_or_set, make_key
+from src.utils.concurrency import RateLimiter, submit_with_app_context
 
 load_dotenv()
 
@@ -13,8 +20,101 @@ load_dotenv()
 CROSSREF_API_KEY = os.getenv("CROSSREF_API_KEY")
 SEMANTIC_SCHOLAR_KEY = os.getenv("SEMANTIC_SCHOLAR_KEY")
 
+# Maximum number of citation lookups in flight at once, per process
+CITATION_MAX_WORKERS = int(os.getenv("CITATION_MAX_WORKERS", "10"))
+
+# Shared by all requests, so concurrent uploads queue behind the same cap
+# instead of each opening CITATION_MAX_WORKERS connections to the APIs
+_LOOKUP_EXECUTOR = ThreadPoolExecutor(max_workers=CITATION_MAX_WORKERS, thread_name_prefix="citation-lookup")
+
+# Requests per second sent to each API, per process (cache hits are free).
+# CrossRef asks polite-pool clients to stay around 10/s; Semantic Scholar
+# keys start at 1/s. Going over only earns 429s and retries
+CROSSREF_RATE_LIMIT = float(os.getenv("CROSSREF_RATE_LIMIT", "10"))
+SEMANTIC_SCHOLAR_RATE_LIMIT = float(os.getenv("SEMANTIC_SCHOLAR_RATE_LIMIT", "1"))
+
+_RATE_LIMITERS = {
+    "api.crossref.org": RateLimiter(CROSSREF_RATE_LIMIT, burst=int(CROSSREF_RATE_LIMIT)),
+    "api.semanticscholar.org": RateLimiter(SEMANTIC_SCHOLAR_RATE_LIMIT, burst=int(SEMANTIC_SCHOLAR_RATE_LIMIT)),
+}
+
+# DOIs resolved per CrossRef works request (they travel in the query string)
+CROSSREF_DOI_BATCH_SIZE = 25
+
+# Recent definitive title lookups, kept in memory in front of the persistent
+# cache; keyed by (validator name, normalized title), least recently used first
+TITLE_CACHE_SIZE = 1024
+_title_cache = OrderedDict()
+_title_cache_lock = threading.Lock()
+
+# DOI pattern (Crossref's recommended regex for modern DOIs)
+_DOI_RE = re.compile(r'10\.\d{4,9}/[-._;()/:A-Z0-9]+', re.IGNORECASE)
+
+_REFERENCES_HEADER_RE = re.compile(r'\b(?:references|bibliography|works\s+cited)\b', re.IGNORECASE)
+
+# A heading on a line of its own, optionally numbered ("7. References", "VII REFERENCES")
+_REFERENCES_HEADING_LINE_RE = re.compile(
+    r'^[ \t]*(?:[0-9IVXivx]+\.?[ \t]+)?(?:references|bibliography|works\s+cited)[ \t:]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Upper bound on the references text handed to the parser (it stops at 50 citations)
+MAX_REFERENCES_CHARS = 100_000
+
+# Common patterns for citation starts:
+# - Starts with number: "1. ", "[1]", "(1)"
+# - Starts with author name (capital letter)
+_CITATION_START_RE = re.compile(
+    r'^(?:\d+\.'            # "1. "
+    r'|\[\d+\]'             # "[1]"
+    r'|\(\d+\)'             # "(1)"
+    r'|[A-Z][a-z]+,\s*[A-Z])'  # "Author, A."
+)
+
+# Numbering prefixes ("1. ", "[1] ", "(1) ") and leading "(year)"/"year."
+_CITATION_PREFIX_RE = re.compile(r'^(?:\d+\.\s*)?(?:\[\d+\]\s*)?(?:\(\d+\)\s*)?')
+_LEADING_YEAR_RE = re.compile(r'^(?:\(\d{4}\))?(?:\d{4}\.?)?')
+_QUOTED_TITLE_RE = re.compile(r'"([^"]+)"')
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+# Words that mark journal/conference details rather than a title (matched
+# anywhere in the lowercased text, like the substring checks they replace)
+_JOURNAL_INFO_RE = re.compile(
+    r'journal|proceedings|conference|vol|volume|pp|pages|doi|isbn|issn|retrieved'
+)
+
 logger = logging.getLogger(__name__)
 
+def _create_session() -> requests.Session:
+    """Create an HTTP session that keeps connections to the citation APIs alive."""
+    session = requests.Session()
+    
+    # Identify the tool on every request (CrossRef routes mailto agents to its polite pool)
+    session.headers["User-Agent"] = "Research Paper Analysis Tool (mailto:your-email@example.com)"
+    
+    # Pool sized for the concurrent lookups; retry transient failures briefly
+    retries = Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"})
+    )
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=max(20, CITATION_MAX_WORKERS), max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    
+    return session
+
+# Shared across requests and worker threads so TCP/TLS connections are reused
+_SESSION = _create_session()
+
+def _request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send a request on the shared session, waiting for the API's rate limit."""
+    limiter = _RATE_LIMITERS.get(urlsplit(url).hostname)
+    if limiter is not None:
+        limiter.acquire()
+    return _SESSION.request(method, url, **kwargs)
+
 def validate_citations(citations: list) -> list:
     """
     Validate citations using CrossRef API (free, no key required).
@@ -28,18 +128,34 @@ def validate_citations(citations: list) -> list:
     print("✅ Using CrossRef API for citation validation")
     logger.info("Using CrossRef API for citation validation")
     
-    validated_citations = []
+    # Skip empty or very short citations
+    candidates = [c for c in citations if c and len(c.strip()) >= 10]
+    if not candidates:
+        return []
     
-    for citation_text in citations:
-        if not citation_text or len(citation_text.strip()) < 10:
-            continue
-            
-        # Clean and extract title from citation
-        cleaned_title = _clean_citation_title(citation_text)
-        
-        # Validate using CrossRef API
-        validation_result = _validate_citation_with_crossref(cleaned_title)
-        
+    # Clean and extract title from each citation
+    cleaned_titles = [_clean_citation_title(c) for c in candidates]
+    validation_results = [None] * len(candidates)
+    
+    # Resolve citations that carry a registered DOI with batched requests
+    dois = [_extract_doi(c) for c in candidates]
+    found = _lookup_dois_with_crossref([d for d in dois if d])
+    for i, doi in enumerate(dois):
+        if doi and found.get(doi):
+            validation_results[i] = {"valid": True, "doi": found[doi]}
+    
+    # Validate the rest by title, issuing the lookups concurrently; only
+    # matches are remembered, since misses also cover request errors
+    pending = [i for i, result in enumerate(validation_results) if result is None]
+    results = _lookup_titles(
+        _validate_citation_with_crossref, [cleaned_titles[i] for i in pending],
+        cacheable=lambda result: result["valid"]
+    )
+    for i, result in zip(pending, results):
+        validation_results[i] = result
+    
+    validated_citations = []
+    for citation_text, validation_result in zip(candidates, validation_results):
         validated_citations.append({
             "citation": citation_text,
             "valid": validation_result["valid"],
@@ -48,6 +164,20 @@ def validate_citations(citations: list) -> list:
     
     return validated_citations
 
+def _cached_get_json(url: str, params: dict = None, headers: dict = None, timeout: int = 10) -> dict:
+    """
+    GET a JSON API response, serving repeated queries from the persistent cache.
+    
+    Only successful responses are cached; request errors propagate to the caller.
+    Headers are not part of the key since they only carry credentials/user agent.
+    """
+    def fetch():
+        response = _request("GET", url, params=params, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+    
+    return get_or_set("http", make_key(url, sorted((params or {}).items())), fetch)
+
 def _validate_citation_with_crossref(title: str) -> dict:
     """Validate a citation title using CrossRef API."""
     if not title or len(title.strip()) < 5:
@@ -62,14 +192,7 @@ def _validate_citation_with_crossref(title: str) -> dict:
             "select": "title,DOI"
         }
         
-        headers = {
-            "User-Agent": "Research Paper Analysis Tool (mailto:your-email@example.com)"
-        }
-        
-        response = requests.get(base_url, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = _cached_get_json(base_url, params=params, timeout=10)
         
         if 'message' in data and 'items' in data['message'] and len(data['message']['items']) > 0:
             item = data['message']['items'][0]
@@ -98,14 +221,14 @@ def validate(full_text: str) -> list[dict]:
     Returns:
         List of citation dictionaries with raw, cleaned_title, and status
     """
-    # Extract references section
-    references_text = _extract_references_section(full_text)
+    # Locate the references section
+    references_start = _find_references_start(full_text)
     
-    if not references_text:
+    if references_start < 0:
         return []
     
-    # Parse individual citations
-    citations = _parse_citations(references_text)
+    # Parse individual citations straight out of the document text
+    citations = _parse_citations(full_text, references_start, references_start + MAX_REFERENCES_CHARS)
     
     # Check if we have API keys available
     if not SEMANTIC_SCHOLAR_KEY and not CROSSREF_API_KEY:
@@ -119,15 +242,32 @@ def validate(full_text: str) -> list[dict]:
         print("✅ Using CrossRef API for citation validation")
         logger.info("Using CrossRef API for citation validation")
     
-    # Validate each citation
+    # Limit to 50 citations and skip very short ones
+    candidates = [c for c in citations[:50] if len(c.strip()) >= 10]
+    cleaned_titles = [_clean_citation_title(c) for c in candidates]
+    statuses = [None] * len(candidates)
+    
+    # Resolve citations that carry a DOI with batched requests
+    dois = [_extract_doi(c) for c in candidates]
+    if SEMANTIC_SCHOLAR_KEY:
+        found = _lookup_dois_with_semantic_scholar([d for d in dois if d])
+    else:
+        found = _lookup_dois_with_crossref([d for d in dois if d])
+    for i, doi in enumerate(dois):
+        if doi and found.get(doi):
+            statuses[i] = "Valid"
+    
+    # Search the remaining citations by title, issuing the lookups concurrently
+    pending = [i for i, status in enumerate(statuses) if status is None]
+    results = _lookup_titles(
+        _validate_citation_with_api, [cleaned_titles[i] for i in pending],
+        cacheable=lambda status: status in ("Valid", "Not Found")
+    )
+    for i, status in zip(pending, results):
+        statuses[i] = status
+    
     validated_citations = []
-    for citation_text in citations[:50]:  # Limit to 50 citations
-        if len(citation_text.strip()) < 10:  # Skip very short citations
-            continue
-            
-        cleaned_title = _clean_citation_title(citation_text)
-        status = _validate_citation_with_api(cleaned_title)
-        
+    for citation_text, cleaned_title, status in zip(candidates, cleaned_titles, statuses):
         validated_citations.append({
             "raw": citation_text,
             "cleaned_title": cleaned_title,
@@ -136,29 +276,194 @@ def validate(full_text: str) -> list[dict]:
     
     return validated_citations
 
-def _extract_references_section(text: str) -> str:
-    """Extract the references section from document text."""
-    # Find references header (case insensitive)
-    references_pattern = r'\b(?:references|bibliography|works\s+cited)\b'
-    match = re.search(references_pattern, text, re.IGNORECASE)
+def _lookup_titles(validator, titles: list[str], cacheable) -> list:
+    """
+    Validate citation titles concurrently, once per distinct title.
+    
+    Titles that differ only in case or surrounding whitespace share a lookup,
+    and recent results are reused from an in-process LRU cache.
     
+    Args:
+        validator: Function validating a single title (must not raise)
+        titles: Cleaned citation titles
+        cacheable: Predicate telling whether a result may be reused later
+        
+    Returns:
+        One validator result per title, in input order
+    """
+    keys = [(validator.__name__, title.strip().lower()[:200]) for title in titles]
+    results = {}
+    
+    with _title_cache_lock:
+        for key in keys:
+            if key in _title_cache:
+                _title_cache.move_to_end(key)
+                results[key] = _title_cache[key]
+    
+    # First title seen for each key that still needs a lookup
+    pending = {}
+    for key, title in zip(keys, titles):
+        if key not in results and key not in pending:
+            pending[key] = title
+    
+    futures = {
+        key: submit_with_app_context(_LOOKUP_EXECUTOR, validator, title)
+        for key, title in pending.items()
+    }
+    for key, future in futures.items():
+        results[key] = future.result()
+        if cacheable(results[key]):
+            with _title_cache_lock:
+                _title_cache[key] = results[key]
+                if len(_title_cache) > TITLE_CACHE_SIZE:
+                    _title_cache.popitem(last=False)
+    
+    return [results[key] for key in keys]
+
+def _extract_doi(citation_text: str) -> str:
+    """Extract a normalized DOI from a citation, or None if it has none."""
+    match = _DOI_RE.search(citation_text)
     if not match:
-        return ""
+        return None
+    # Drop sentence punctuation that the pattern picks up at the end
+    return match.group(0).rstrip('.,;').lower()
+
+def _lookup_dois_with_semantic_scholar(dois: list[str]) -> dict:
+    """
+    Look up DOIs with one Semantic Scholar paper/batch request.
+    
+    Args:
+        dois: Normalized DOIs to look up
+        
+    Returns:
+        Dictionary mapping each resolved DOI to whether a paper was found.
+        DOIs are left out if the request fails, so callers can fall back.
+    """
+    results = {}
+    missing = []
+    for doi in dict.fromkeys(dois):  # De-duplicate, keep order
+        cached = cache_get("s2_doi", make_key(doi))
+        if cached is None:
+            missing.append(doi)
+        else:
+            results[doi] = cached
+    
+    if not missing:
+        return results
+    
+    try:
+        batch_url = current_app.config.get('SEMANTIC_SCHOLAR_BATCH_URL', 'https://api.semanticscholar.org/graph/v1/paper/batch')
+        response = _request(
+            "POST",
+            batch_url,
+            params={"fields": "title"},
+            json={"ids": [f"DOI:{doi}" for doi in missing]},
+            headers={'x-api-key': SEMANTIC_SCHOLAR_KEY},
+            timeout=10
+        )
+        response.raise_for_status()
+        papers = response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.warning(f"Semantic Scholar batch lookup failed: {e}")
+        return results
     
-    # Extract text from references section onwards
-    references_start = match.start()
-    references_text = text[references_start:]
+    # The batch endpoint returns one entry per id, in order (null if unknown)
+    for doi, paper in zip(missing, papers):
+        results[doi] = paper is not None
+        cache_set("s2_doi", make_key(doi), results[doi])
     
-    return references_text
+    return results
 
-def _parse_citations(references_text: str) -> list[str]:
-    """Parse individual citations from references section."""
-    lines = references_text.split('\n')
+def _lookup_dois_with_crossref(dois: list[str]) -> dict:
+    """
+    Look up DOIs with CrossRef, CROSSREF_DOI_BATCH_SIZE per works request.
+    
+    Args:
+        dois: Normalized DOIs to look up
+        
+    Returns:
+        Dictionary mapping each resolved DOI to the DOI as registered with
+        CrossRef, or None if CrossRef does not know it. DOIs are left out if
+        their request fails, so callers can fall back.
+    """
+    results = {}
+    missing = []
+    for doi in dict.fromkeys(dois):  # De-duplicate, keep order
+        cached = cache_get("crossref_doi", make_key(doi))
+        if cached is None:
+            missing.append(doi)
+        else:
+            results[doi] = cached or None
+    
+    base_url = "https://api.crossref.org/works"
+    for start in range(0, len(missing), CROSSREF_DOI_BATCH_SIZE):
+        batch = missing[start:start + CROSSREF_DOI_BATCH_SIZE]
+        try:
+            # Repeated doi: filters are OR-ed, so one request covers the batch
+            response = _request(
+                "GET",
+                base_url,
+                params={
+                    "filter": ",".join(f"doi:{doi}" for doi in batch),
+                    "rows": len(batch),
+                    "select": "DOI"
+                },
+                timeout=10
+            )
+            response.raise_for_status()
+            items = response.json()["message"]["items"]
+        except (requests.exceptions.RequestException, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"CrossRef DOI lookup failed: {e}")
+            continue
+        
+        registered = {item["DOI"].lower(): item["DOI"] for item in items if item.get("DOI")}
+        for doi in batch:
+            results[doi] = registered.get(doi)
+            # Unknown DOIs are cached as False, since None reads as a miss
+            cache_set("crossref_doi", make_key(doi), results[doi] or False)
+    
+    return results
+
+def _find_references_start(text: str) -> int:
+    """Return the offset of the references section in text, or -1 if none."""
+    # The section sits at the end of the paper, so prefer the last standalone
+    # heading; the word "references" also shows up in body text
+    headings = list(_REFERENCES_HEADING_LINE_RE.finditer(text))
+    match = headings[-1] if headings else _REFERENCES_HEADER_RE.search(text)
+    
+    return match.start() if match else -1
+
+def _parse_citations(text: str, start: int = 0, end: int = None) -> list[str]:
+    """
+    Parse individual citations from the references section.
+    
+    Lines are read one at a time straight from text (no copy of the section
+    and no list of lines), and reading stops once 50 citations are found.
+    
+    Args:
+        text: Document text (or just the references section)
+        start: Offset of the references heading in text
+        end: Offset at which to stop reading (default: end of text)
+        
+    Returns:
+        List of raw citation strings
+    """
+    end = len(text) if end is None else min(end, len(text))
     citations = []
     current_citation = ""
     
-    for line in lines[1:]:  # Skip the "References" header line
-        line = line.strip()
+    # Skip the "References" header line
+    line_start = text.find('\n', start, end)
+    if line_start < 0:
+        return citations
+    line_start += 1
+    
+    while line_start < end:
+        line_end = text.find('\n', line_start, end)
+        if line_end < 0:
+            line_end = end
+        line = text[line_start:line_end].strip()
+        line_start = line_end + 1
         
         if not line:
             # Empty line - end current citation if it exists
@@ -188,37 +493,17 @@ def _parse_citations(references_text: str) -> list[str]:
 
 def _is_new_citation_start(line: str) -> bool:
     """Check if a line starts a new citation."""
-    line = line.strip()
-    
-    # Common patterns for citation starts:
-    # - Starts with number: "1. ", "[1]", "(1)"
-    # - Starts with author name (capital letter)
-    # - After substantial whitespace from previous
-    
-    patterns = [
-        r'^\d+\.',           # "1. "
-        r'^\[\d+\]',         # "[1]"
-        r'^\(\d+\)',         # "(1)"
-        r'^[A-Z][a-z]+,\s*[A-Z]',  # "Author, A."
-    ]
-    
-    for pattern in patterns:
-        if re.match(pattern, line):
-            return True
-    
-    return False
+    return _CITATION_START_RE.match(line.strip()) is not None
 
 def _clean_citation_title(citation_text: str) -> str:
     """Extract and clean the title from a citation."""
     citation = citation_text.strip()
     
     # Remove common prefixes (numbers, brackets, etc.)
-    citation = re.sub(r'^\d+\.\s*', '', citation)
-    citation = re.sub(r'^\[\d+\]\s*', '', citation)
-    citation = re.sub(r'^\(\d+\)\s*', '', citation)
+    citation = _CITATION_PREFIX_RE.sub('', citation)
     
     # Look for quoted titles first
-    quoted_match = re.search(r'"([^"]+)"', citation)
+    quoted_match = _QUOTED_TITLE_RE.search(citation)
     if quoted_match:
         title = quoted_match.group(1)
         if 5 < len(title) < 160:
@@ -236,8 +521,7 @@ def _clean_citation_title(citation_text: str) -> str:
             potential_title = parts[i].strip()
             
             # Clean up common artifacts
-            potential_title = re.sub(r'^\(\d{4}\)', '', potential_title)  # Remove (year)
-            potential_title = re.sub(r'^\d{4}\.?', '', potential_title)   # Remove year
+            potential_title = _LEADING_YEAR_RE.sub('', potential_title)  # Remove (year) / year
             potential_title = potential_title.strip()
             
             # Check if this looks like a title
@@ -245,7 +529,7 @@ def _clean_citation_title(citation_text: str) -> str:
                 return potential_title
     
     # Fallback: take first substantial part after cleaning
-    cleaned = re.sub(r'[^\w\s]', ' ', citation)  # Remove punctuation
+    cleaned = _PUNCTUATION_RE.sub(' ', citation)  # Remove punctuation
     words = cleaned.split()
     
     # Skip author-like words at the beginning
@@ -273,13 +557,7 @@ def _clean_citation_title(citation_text: str) -> str:
 
 def _looks_like_journal_info(text: str) -> bool:
     """Check if text looks like journal/conference information."""
-    journal_indicators = [
-        'journal', 'proceedings', 'conference', 'vol', 'volume', 
-        'pp', 'pages', 'doi', 'isbn', 'issn', 'retrieved'
-    ]
-    
-    text_lower = text.lower()
-    return any(indicator in text_lower for indicator in journal_indicators)
+    return _JOURNAL_INFO_RE.search(text.lower()) is not None
 
 
 def _generate_mock_citation_results(citations: list) -> list:
@@ -394,20 +672,18 @@ def _validate_with_semantic_scholar(title: str) -> str:
         base_url = current_app.config.get('SEMANTIC_SCHOLAR_BASE', 'https://api.semanticscholar.org/graph/v1/paper/search')
         fields = current_app.config.get('SEMANTIC_SCHOLAR_FIELDS', 'title,authors,year,venue')
         
-        # Clean title for API query
-        query = title.strip()[:200]  # Limit query length
-        encoded_query = quote(query)
-        
-        url = f"{base_url}?query={encoded_query}&limit=1&fields={fields}"
+        # Clean title for API query; requests handles the URL encoding
+        params = {
+            "query": title.strip()[:200],  # Limit query length
+            "limit": 1,
+            "fields": fields
+        }
         
         headers = {}
         if SEMANTIC_SCHOLAR_KEY:
             headers['x-api-key'] = SEMANTIC_SCHOLAR_KEY
         
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = _cached_get_json(base_url, params=params, headers=headers, timeout=10)
         
         if 'data' in data and len(data['data']) > 0:
             return "Valid"
@@ -1,57 +1,333 @@
 import re
 import logging
-from typing import Dict, List
+from collections import Counter
+from typing import Dict, List, Tuple
 
-def critique_paper(text: str) -> dict:
+try:
+    import ahocorasick
+except ImportError:  # Optional: fall back to one str.count() scan per term
+    ahocorasick = None
+
+try:
+    import re2
+except ImportError:  # Optional: fall back to the re module's backtracking engine
+    re2 = None
+
+# Patterns are compiled once at import instead of on every critique call
+# Sentences are the runs of text between sentence-ending punctuation
+_SENTENCE_RE = re.compile(r'[^.!?]+')
+
+# Sample size mentions ("n = 120", "sample size of 120", "120 participants",
+# "120 subjects") folded into one alternation so the text is scanned once
+_SAMPLE_SIZE_RE = re.compile(
+    r'n\s*=\s*(\d+)'
+    r'|sample size.*?(\d+)'
+    r'|(\d+)\s+participants'
+    r'|(\d+)\s+subjects',
+    re.IGNORECASE
+)
+
+# A references heading on a line of its own, optionally numbered
+# ("7. References", "VII REFERENCES"), as the citation parser looks for it
+_REFERENCES_HEADING_RE = re.compile(
+    r'^[ \t]*(?:[0-9IVXivx]+\.?[ \t]+)?(?:references|bibliography|works\s+cited)[ \t:]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Passive voice detection (heuristic): "was/were/been/is/are <verb>ed"
+_PASSIVE_RE = re.compile(r'\b(?:was|were|been|is|are)\s+\w+ed\b', re.IGNORECASE)
+
+# RE2 versions of the patterns above (linear time, several times faster on
+# long papers). RE2's \s, \w and \d only cover ASCII, so the Unicode classes
+# the re module uses are spelled out explicitly
+_RE2_SPACE = r'[\pZ\t\n\v\f\r\x1c-\x1f\x85]'
+_RE2_WORD = r'[\pL\pN_]'
+_RE2_DIGIT = r'\p{Nd}'
+
+if re2 is not None:
+    _SAMPLE_SIZE_RE2 = re2.compile(
+        rf'(?i)n{_RE2_SPACE}*={_RE2_SPACE}*({_RE2_DIGIT}+)'
+        rf'|sample size.*?({_RE2_DIGIT}+)'
+        rf'|({_RE2_DIGIT}+){_RE2_SPACE}+participants'
+        rf'|({_RE2_DIGIT}+){_RE2_SPACE}+subjects'
+    )
+    _PASSIVE_RE2 = re2.compile(
+        rf'(?i)\b(?:was|were|been|is|are){_RE2_SPACE}+{_RE2_WORD}+ed\b'
+    )
+else:
+    _SAMPLE_SIZE_RE2 = _PASSIVE_RE2 = None
+
+# Keyword lists used by the critique_paper() methodology and bias assessments
+_METHODOLOGY_TERMS = [
+    'method', 'methodology', 'approach', 'procedure', 'technique',
+    'experiment', 'survey', 'interview', 'analysis', 'statistical'
+]
+
+_STATS_TERMS = [
+    'p-value', 'significant', 'correlation', 'regression',
+    'anova', 't-test', 'chi-square', 'confidence interval'
+]
+
+_DATA_TERMS = ['quantitative', 'statistical', 'data']
+
+_BIAS_INDICATORS = [
+    'obviously', 'clearly', 'undoubtedly', 'certainly', 'definitely',
+    'always', 'never', 'all', 'none', 'everyone', 'no one'
+]
+
+# Hedging language (good for reducing bias)
+_HEDGE_WORDS = [
+    'might', 'could', 'may', 'possibly', 'perhaps', 'seems to',
+    'appears to', 'suggests that', 'indicates that'
+]
+
+_BIAS_DISCUSSION_TERMS = ['limitation', 'bias']
+
+_JARGON_TERMS = [
+    'aforementioned', 'heretofore', 'wherein', 'whereby', 'thereof',
+    'utilize', 'facilitate', 'implement', 'methodology'
+]
+
+_DEFINITION_TERMS = ['defined as', 'refers to', 'means', 'is the', 'called']
+
+# Common academic sections and the keywords that indicate them
+_SECTION_KEYWORDS = {
+    'abstract': ['abstract'],
+    'introduction': ['introduction'],
+    'methodology': ['method', 'methodology'],
+    'results': ['result', 'findings'],
+    'discussion': ['discussion', 'conclusion'],
+    'references': ['references', 'bibliography']
+}
+
+_ASSESSMENT_TERMS = list(dict.fromkeys(
+    _METHODOLOGY_TERMS + _STATS_TERMS + _DATA_TERMS +
+    _BIAS_INDICATORS + _HEDGE_WORDS + _BIAS_DISCUSSION_TERMS +
+    _JARGON_TERMS + _DEFINITION_TERMS +
+    [keyword for keywords in _SECTION_KEYWORDS.values() for keyword in keywords]
+))
+
+# Keyword lists used by the critique() analyses
+_ANALYSIS_METHODOLOGY_TERMS = {
+    'experiment': ['experiment', 'experimental', 'trial'],
+    'survey': ['survey', 'questionnaire', 'poll'],
+    'interview': ['interview', 'interviews', 'interviewed'],
+    'qualitative': ['qualitative', 'thematic analysis', 'grounded theory'],
+    'quantitative': ['quantitative', 'statistical', 'numerical'],
+    'sample_size': ['sample size', 'n =', 'participants', 'subjects'],
+    'randomized': ['randomized', 'random assignment', 'control group'],
+    'bias': ['bias', 'confounding', 'threats to validity']
+}
+
+_ANALYSIS_STATS_TERMS = [
+    'p-value', 'p <', 'significant', 'correlation', 'regression',
+    'anova', 't-test', 'chi-square', 'effect size', 'confidence interval'
+]
+
+_LIMITATION_TERMS = [
+    'limitation', 'limitations', 'threats to validity',
+    'scope', 'boundary', 'constraint', 'restriction'
+]
+
+_GENERALIZABILITY_TERMS = [
+    'generaliz', 'external validity', 'broader population',
+    'applicability', 'transferability'
+]
+
+_DATA_AVAILABILITY_TERMS = [
+    'data available', 'dataset', 'code available', 'reproducible',
+    'replication', 'open data', 'github', 'repository'
+]
+
+_ETHICS_TERMS = [
+    'ethics', 'ethical', 'consent', 'irb', 'institutional review',
+    'privacy', 'confidentiality', 'anonymous'
+]
+
+_NOVELTY_TERMS = ['novel', 'new', 'innovative', 'first', 'original']
+
+_FUTURE_WORK_TERMS = ['future work', 'future research']
+
+_ANALYSIS_TERMS = list(dict.fromkeys(
+    [term for terms in _ANALYSIS_METHODOLOGY_TERMS.values() for term in terms] +
+    _ANALYSIS_STATS_TERMS + _HEDGE_WORDS + _JARGON_TERMS +
+    _LIMITATION_TERMS + _GENERALIZABILITY_TERMS + _DATA_AVAILABILITY_TERMS +
+    _ETHICS_TERMS + _NOVELTY_TERMS + _FUTURE_WORK_TERMS
+))
+
+
+def _build_automaton(terms: List[str]):
+    """Build an Aho-Corasick automaton over terms, or None if unavailable."""
+    if ahocorasick is None:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for term in terms:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    return automaton
+
+_ASSESSMENT_AUTOMATON = _build_automaton(_ASSESSMENT_TERMS)
+_ANALYSIS_AUTOMATON = _build_automaton(_ANALYSIS_TERMS)
+
+
+def _count_terms(text_lower: str, terms: List[str], automaton) -> Counter:
+    """
+    Count substring occurrences of every term in a single pass over the text.
+    
+    Args:
+        text_lower: Lowercased document text
+        terms: Terms to count
+        automaton: Automaton built from terms by _build_automaton()
+        
+    Returns:
+        Counter mapping each found term to its number of occurrences
+    """
+    if automaton is None:
+        return Counter({term: text_lower.count(term) for term in terms})
+    
+    # Like str.count(), skip occurrences that overlap an earlier one of the
+    # same term (e.g. the second "anova" in "anovanova")
+    counts = Counter()
+    next_start = {}
+    for end, term in automaton.iter(text_lower):
+        start = end - len(term) + 1
+        if start >= next_start.get(term, 0):
+            counts[term] += 1
+            next_start[term] = end + 1
+    return counts
+
+def _is_word_char(char: str) -> bool:
+    """Whether char is a word character in the sense of the re module's \\w."""
+    return char.isalnum() or char == '_'
+
+def _find_sample_sizes(text: str) -> List[str]:
+    """Return the number captured by every sample size mention in text."""
+    pattern = _SAMPLE_SIZE_RE2 if _SAMPLE_SIZE_RE2 is not None else _SAMPLE_SIZE_RE
+    return [match.group(match.lastindex) for match in pattern.finditer(text)]
+
+def _count_passive(text: str) -> int:
+    """Count passive voice constructions in text."""
+    if _PASSIVE_RE2 is None:
+        return len(_PASSIVE_RE.findall(text))
+    
+    # RE2's \b only treats ASCII as word characters; drop matches glued to a
+    # non-ASCII letter or digit, which the re module would not have matched
+    count = 0
+    for match in _PASSIVE_RE2.finditer(text):
+        start, end = match.span()
+        if start > 0 and _is_word_char(text[start - 1]):
+            continue
+        if end < len(text) and _is_word_char(text[end]):
+            continue
+        count += 1
+    return count
+
+def _strip_references(text: str, text_lower: str) -> Tuple[str, str, bool]:
+    """
+    Cut the references section off the end of a document.
+    
+    Reference lists are author names and venues rather than prose; left in,
+    they skew the sentence statistics and keyword counts. Only a standalone
+    heading past the first third of the document is trusted, so a
+    "References" line in a table of contents does not cut the paper short.
+    
+    Args:
+        text: Full document text
+        text_lower: text.lower()
+        
+    Returns:
+        Tuple of (body text, body text lowercased, whether a section was cut)
+    """
+    headings = list(_REFERENCES_HEADING_RE.finditer(text))
+    if not headings or headings[-1].start() < len(text) // 3:
+        return text, text_lower, False
+    
+    start = headings[-1].start()
+    # lower() lengthens a few characters (e.g. "İ"); offsets only carry over
+    # to text_lower when nothing moved
+    body_lower = text_lower[:start] if len(text_lower) == len(text) else text[:start].lower()
+    return text[:start], body_lower, True
+
+def _has_more_words_than(text: str, limit: int) -> bool:
+    """Whether text has more than limit words, splitting no further than needed."""
+    return len(text.split(maxsplit=limit)) > limit
+
+def _sentence_stats(text: str) -> Tuple[int, float]:
+    """
+    Count the sentences in text and their average length in one pass.
+    
+    Fragments of five characters or fewer (stray punctuation, numbering)
+    are not counted as sentences.
+    
+    Args:
+        text: Document text
+        
+    Returns:
+        Tuple of (sentence count, average words per sentence; 0.0 if none)
+    """
+    sentence_count = 0
+    total_words = 0
+    for match in _SENTENCE_RE.finditer(text):
+        sentence = match.group()
+        if len(sentence.strip()) > 5:
+            sentence_count += 1
+            total_words += len(sentence.split())
+    
+    avg_length = total_words / sentence_count if sentence_count else 0.0
+    return sentence_count, avg_length
+
+def critique_paper(text: str, text_lower: str = None, include_references: bool = False) -> dict:
     """
     Critique paper using basic NLP and heuristics.
     
     Args:
         text: Full document text
+        text_lower: text.lower(), if the caller already computed it
+        include_references: Also analyze the references section
         
     Returns:
         Dictionary with clarity, methodology, bias, and structure assessments
     """
-    text_lower = text.lower()
+    if text_lower is None:
+        text_lower = text.lower()
+    
+    has_references = False
+    if not include_references:
+        text, text_lower, has_references = _strip_references(text, text_lower)
+    
+    # Count every keyword the assessments look for in one pass over the text
+    term_counts = _count_terms(text_lower, _ASSESSMENT_TERMS, _ASSESSMENT_AUTOMATON)
     
     critique_result = {
-        "clarity": _assess_clarity(text, text_lower),
-        "methodology": _assess_methodology(text_lower),
-        "bias": _assess_bias(text_lower),
-        "structure": _assess_structure(text, text_lower)
+        "clarity": _assess_clarity(text, _sentence_stats(text), term_counts),
+        "methodology": _assess_methodology(term_counts),
+        "bias": _assess_bias(term_counts),
+        "structure": _assess_structure(term_counts, has_references)
     }
     
     return critique_result
 
-def _assess_clarity(text: str, text_lower: str) -> str:
+def _assess_clarity(text: str, sentence_stats: Tuple[int, float], term_counts: Counter) -> str:
     """Assess writing clarity and readability."""
     issues = []
     
     # Sentence length analysis
-    sentences = re.split(r'[.!?]+', text)
-    sentence_lengths = [len(sentence.split()) for sentence in sentences if len(sentence.strip()) > 5]
-    
-    if sentence_lengths:
-        avg_length = sum(sentence_lengths) / len(sentence_lengths)
+    sentence_count, avg_length = sentence_stats
+    if sentence_count:
         if avg_length > 25:
             issues.append("sentences too long")
         elif avg_length < 8:
             issues.append("sentences too short")
     
     # Check for jargon
-    jargon_indicators = [
-        'aforementioned', 'heretofore', 'wherein', 'whereby', 'thereof',
-        'utilize', 'facilitate', 'implement', 'methodology'
-    ]
-    
-    jargon_count = sum(text_lower.count(word) for word in jargon_indicators)
+    jargon_count = sum(term_counts[word] for word in _JARGON_TERMS)
     if jargon_count > 15:
         issues.append("excessive jargon")
     
     # Check for definitions
-    definition_indicators = ['defined as', 'refers to', 'means', 'is the', 'called']
-    definition_count = sum(text_lower.count(phrase) for phrase in definition_indicators)
-    if definition_count < 3 and len(text.split()) > 1000:
+    definition_count = sum(term_counts[phrase] for phrase in _DEFINITION_TERMS)
+    if definition_count < 3 and _has_more_words_than(text, 1000):
         issues.append("lacks definitions")
     
     if not issues:
@@ -59,69 +335,43 @@ def _assess_clarity(text: str, text_lower: str) -> str:
     else:
         return f"Issues found: {', '.join(issues)}"
 
-def _assess_methodology(text_lower: str) -> str:
+def _assess_methodology(term_counts: Counter) -> str:
     """Assess methodology description."""
-    methodology_terms = [
-        'method', 'methodology', 'approach', 'procedure', 'technique',
-        'experiment', 'survey', 'interview', 'analysis', 'statistical'
-    ]
-    
-    found_terms = [term for term in methodology_terms if term in text_lower]
+    found_terms = [term for term in _METHODOLOGY_TERMS if term_counts[term]]
     
     # Check for statistical methods
-    stats_terms = [
-        'p-value', 'significant', 'correlation', 'regression',
-        'anova', 't-test', 'chi-square', 'confidence interval'
-    ]
-    
-    found_stats = [term for term in stats_terms if term in text_lower]
+    found_stats = [term for term in _STATS_TERMS if term_counts[term]]
     
     if len(found_terms) < 3:
         return "Methodology not clearly described"
-    elif len(found_stats) == 0 and any(term in text_lower for term in ['quantitative', 'statistical', 'data']):
+    elif len(found_stats) == 0 and any(term_counts[term] for term in _DATA_TERMS):
         return "Statistical methods not clearly described"
     else:
         return "Methodology adequately described"
 
-def _assess_bias(text_lower: str) -> str:
+def _assess_bias(term_counts: Counter) -> str:
     """Assess potential bias in the paper."""
-    bias_indicators = [
-        'obviously', 'clearly', 'undoubtedly', 'certainly', 'definitely',
-        'always', 'never', 'all', 'none', 'everyone', 'no one'
-    ]
-    
-    strong_claims = sum(text_lower.count(word) for word in bias_indicators)
+    strong_claims = sum(term_counts[word] for word in _BIAS_INDICATORS)
     
     # Check for hedging language (good for reducing bias)
-    hedge_words = [
-        'might', 'could', 'may', 'possibly', 'perhaps', 'seems to',
-        'appears to', 'suggests that', 'indicates that'
-    ]
-    
-    hedge_count = sum(text_lower.count(word) for word in hedge_words)
+    hedge_count = sum(term_counts[word] for word in _HEDGE_WORDS)
     
     if strong_claims > hedge_count * 2:
         return "Potential bias detected - strong claims without hedging"
-    elif 'limitation' in text_lower and 'bias' in text_lower:
+    elif term_counts['limitation'] and term_counts['bias']:
         return "Bias considerations addressed"
     else:
         return "No apparent bias"
 
-def _assess_structure(text: str, text_lower: str) -> str:
+def _assess_structure(term_counts: Counter, has_references: bool = False) -> str:
     """Assess document structure and organization."""
-    # Check for common academic sections
-    sections = {
-        'abstract': ['abstract'],
-        'introduction': ['introduction'],
-        'methodology': ['method', 'methodology'],
-        'results': ['result', 'findings'],
-        'discussion': ['discussion', 'conclusion'],
-        'references': ['references', 'bibliography']
-    }
-    
+    # Check for common academic sections (a stripped references section
+    # counts as found)
     found_sections = []
-    for section_name, keywords in sections.items():
-        if any(keyword in text_lower for keyword in keywords):
+    for section_name, keywords in _SECTION_KEYWORDS.items():
+        if any(term_counts[keyword] for keyword in keywords):
+            found_sections.append(section_name)
+        elif section_name == 'references' and has_references:
             found_sections.append(section_name)
     
     if len(found_sections) >= 4:
@@ -131,19 +381,27 @@ def _assess_structure(text: str, text_lower: str) -> str:
     else:
         return "Poor organization - lacks clear sections"
 
-def critique(text: str, summary: str) -> dict:
+def critique(text: str, summary: str, text_lower: str = None, include_references: bool = False) -> dict:
     """
     Perform heuristic critique of research paper.
     
     Args:
         text: Full document text
         summary: Document summary
+        text_lower: text.lower(), if the caller already computed it
+        include_references: Also analyze the references section
     
     Returns:
         Dictionary with methodology, writing_flags, limitations, suggestions
     """
-    text_lower = text.lower()
-    summary_lower = summary.lower()
+    if text_lower is None:
+        text_lower = text.lower()
+    
+    if not include_references:
+        text, text_lower, _ = _strip_references(text, text_lower)
+    
+    # Count every keyword the analyses look for in one pass over the text
+    term_counts = _count_terms(text_lower, _ANALYSIS_TERMS, _ANALYSIS_AUTOMATON)
     
     critique_result = {
         "methodology": [],
@@ -153,42 +411,31 @@ def critique(text: str, summary: str) -> dict:
     }
     
     # Methodology analysis
-    methodology_issues = _analyze_methodology(text_lower)
+    methodology_issues = _analyze_methodology(text_lower, term_counts)
     critique_result["methodology"].extend(methodology_issues)
     
     # Writing and clarity analysis
-    writing_issues = _analyze_writing_quality(text)
+    writing_issues = _analyze_writing_quality(text, _sentence_stats(text), term_counts)
     critique_result["writing_flags"].extend(writing_issues)
     
     # Limitations analysis
-    limitations = _analyze_limitations(text_lower)
+    limitations = _analyze_limitations(term_counts)
     critique_result["limitations"].extend(limitations)
     
     # Generate suggestions
-    suggestions = _generate_suggestions(text_lower, critique_result)
+    suggestions = _generate_suggestions(term_counts, critique_result)
     critique_result["suggestions"].extend(suggestions)
     
     return critique_result
 
-def _analyze_methodology(text: str) -> List[str]:
+def _analyze_methodology(text: str, term_counts: Counter) -> List[str]:
     """Analyze methodology aspects of the paper."""
     issues = []
     
     # Check for methodology terms
-    methodology_terms = {
-        'experiment': ['experiment', 'experimental', 'trial'],
-        'survey': ['survey', 'questionnaire', 'poll'],
-        'interview': ['interview', 'interviews', 'interviewed'],
-        'qualitative': ['qualitative', 'thematic analysis', 'grounded theory'],
-        'quantitative': ['quantitative', 'statistical', 'numerical'],
-        'sample_size': ['sample size', 'n =', 'participants', 'subjects'],
-        'randomized': ['randomized', 'random assignment', 'control group'],
-        'bias': ['bias', 'confounding', 'threats to validity']
-    }
-    
     found_terms = {}
-    for category, terms in methodology_terms.items():
-        found = [term for term in terms if term in text]
+    for category, terms in _ANALYSIS_METHODOLOGY_TERMS.items():
+        found = [term for term in terms if term_counts[term]]
         if found:
             found_terms[category] = found
     
@@ -198,17 +445,7 @@ def _analyze_methodology(text: str) -> List[str]:
         issues.append("Limited methodology terminology detected")
     
     # Check for sample size mentions
-    sample_patterns = [
-        r'n\s*=\s*(\d+)',
-        r'sample size.*?(\d+)',
-        r'(\d+)\s+participants',
-        r'(\d+)\s+subjects'
-    ]
-    
-    sample_sizes = []
-    for pattern in sample_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        sample_sizes.extend(matches)
+    sample_sizes = _find_sample_sizes(text)
     
     if sample_sizes:
         sizes = [int(s) for s in sample_sizes if s.isdigit()]
@@ -222,12 +459,7 @@ def _analyze_methodology(text: str) -> List[str]:
         issues.append("No explicit sample size found")
     
     # Check for statistical analysis
-    stats_terms = [
-        'p-value', 'p <', 'significant', 'correlation', 'regression',
-        'anova', 't-test', 'chi-square', 'effect size', 'confidence interval'
-    ]
-    
-    found_stats = [term for term in stats_terms if term in text]
+    found_stats = [term for term in _ANALYSIS_STATS_TERMS if term_counts[term]]
     if found_stats:
         issues.append(f"Statistical analysis: {', '.join(found_stats[:3])}")
     else:
@@ -235,114 +467,71 @@ def _analyze_methodology(text: str) -> List[str]:
     
     return issues
 
-def _analyze_writing_quality(text: str) -> List[str]:
+def _analyze_writing_quality(text: str, sentence_stats: Tuple[int, float], term_counts: Counter) -> List[str]:
     """Analyze writing quality and clarity."""
     issues = []
     
     # Sentence length analysis
-    sentences = re.split(r'[.!?]+', text)
-    sentence_lengths = [len(sentence.split()) for sentence in sentences if len(sentence.strip()) > 5]
-    
-    if sentence_lengths:
-        avg_length = sum(sentence_lengths) / len(sentence_lengths)
+    sentence_count, avg_length = sentence_stats
+    if sentence_count:
         if avg_length > 25:
             issues.append(f"Long average sentence length ({avg_length:.1f} words)")
         elif avg_length < 10:
             issues.append(f"Short average sentence length ({avg_length:.1f} words)")
     
     # Passive voice detection (heuristic)
-    passive_indicators = [
-        r'\bwas\s+\w+ed\b',
-        r'\bwere\s+\w+ed\b',
-        r'\bbeen\s+\w+ed\b',
-        r'\bis\s+\w+ed\b',
-        r'\bare\s+\w+ed\b'
-    ]
-    
-    passive_count = 0
-    for pattern in passive_indicators:
-        passive_count += len(re.findall(pattern, text, re.IGNORECASE))
-    
-    total_sentences = len([s for s in sentences if len(s.strip()) > 5])
-    if total_sentences > 0:
-        passive_ratio = passive_count / total_sentences
+    passive_count = _count_passive(text)
+    
+    if sentence_count > 0:
+        passive_ratio = passive_count / sentence_count
         if passive_ratio > 0.3:
             issues.append(f"High passive voice usage ({passive_ratio:.1%})")
     
     # Check for hedging language
-    hedge_words = [
-        'might', 'could', 'may', 'possibly', 'perhaps', 'seems to',
-        'appears to', 'suggests that', 'indicates that'
-    ]
-    
-    hedge_count = sum(text.lower().count(word) for word in hedge_words)
-    if hedge_count > len(text.split()) * 0.02:  # More than 2% hedging
+    hedge_count = sum(term_counts[word] for word in _HEDGE_WORDS)
+    # More than 2% hedging, i.e. fewer than 50 words per hedge
+    if hedge_count and not _has_more_words_than(text, 50 * hedge_count - 1):
         issues.append("Frequent hedging language detected")
     
     # Check for clarity issues
-    jargon_indicators = [
-        'aforementioned', 'heretofore', 'wherein', 'whereby', 'thereof',
-        'utilize', 'facilitate', 'implement', 'methodology'
-    ]
-    
-    jargon_count = sum(text.lower().count(word) for word in jargon_indicators)
+    jargon_count = sum(term_counts[word] for word in _JARGON_TERMS)
     if jargon_count > 10:
         issues.append("Academic jargon may affect readability")
     
     return issues
 
-def _analyze_limitations(text: str) -> List[str]:
+def _analyze_limitations(term_counts: Counter) -> List[str]:
     """Analyze research limitations and validity threats."""
     limitations = []
     
     # Check for limitations section
-    limitations_keywords = [
-        'limitation', 'limitations', 'threats to validity',
-        'scope', 'boundary', 'constraint', 'restriction'
-    ]
-    
-    found_limitations = [kw for kw in limitations_keywords if kw in text]
+    found_limitations = [kw for kw in _LIMITATION_TERMS if term_counts[kw]]
     if found_limitations:
         limitations.append("Limitations section present")
     else:
         limitations.append("No explicit limitations discussion found")
     
     # Check for generalizability discussion
-    generalizability_terms = [
-        'generaliz', 'external validity', 'broader population',
-        'applicability', 'transferability'
-    ]
-    
-    if any(term in text for term in generalizability_terms):
+    if any(term_counts[term] for term in _GENERALIZABILITY_TERMS):
         limitations.append("Generalizability addressed")
     else:
         limitations.append("Limited discussion of generalizability")
     
     # Check for data availability
-    data_terms = [
-        'data available', 'dataset', 'code available', 'reproducible',
-        'replication', 'open data', 'github', 'repository'
-    ]
-    
-    if any(term in text for term in data_terms):
+    if any(term_counts[term] for term in _DATA_AVAILABILITY_TERMS):
         limitations.append("Data/code availability mentioned")
     else:
         limitations.append("No mention of data or code availability")
     
     # Check for ethical considerations
-    ethics_terms = [
-        'ethics', 'ethical', 'consent', 'irb', 'institutional review',
-        'privacy', 'confidentiality', 'anonymous'
-    ]
-    
-    if any(term in text for term in ethics_terms):
+    if any(term_counts[term] for term in _ETHICS_TERMS):
         limitations.append("Ethical considerations addressed")
     else:
         limitations.append("Limited ethical considerations discussion")
     
     return limitations
 
-def _generate_suggestions(text: str, critique_result: dict) -> List[str]:
+def _generate_suggestions(term_counts: Counter, critique_result: dict) -> List[str]:
     """Generate improvement suggestions based on analysis."""
     suggestions = []
     
@@ -379,14 +568,13 @@ def _generate_suggestions(text: str, critique_result: dict) -> List[str]:
         suggestions.append("Consider making data and analysis code available")
     
     # General suggestions
-    novelty_terms = ['novel', 'new', 'innovative', 'first', 'original']
-    novelty_count = sum(text.count(term) for term in novelty_terms)
+    novelty_count = sum(term_counts[term] for term in _NOVELTY_TERMS)
     
     if novelty_count < 3:
         suggestions.append("Clarify the novel contributions of this work")
     
     # Check for future work
-    if 'future work' not in text and 'future research' not in text:
+    if not any(term_counts[term] for term in _FUTURE_WORK_TERMS):
         suggestions.append("Include discussion of future research directions")
     
     return suggestions[:8]  # Limit to 8 suggestions
\ No newline at end of file
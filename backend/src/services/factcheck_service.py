@@ -4,14 +4,13 @@ import requests
 import logging
 import re
 import random
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
-import nltk
-
-# Download punkt tokenizer data if not already present
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+from requests.adapters import HTTPAdapter
+from src.services.cache import cache_get, get_or_set, make_key
+from src.utils.concurrency import RateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +20,56 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_FACT_CHECK_API_KEY") or os.getenv("GOOGLE_API
 FACTCHECK_USE = os.getenv("FACTCHECK_USE", "api_key")  # "service_account" | "api_key" | "disabled"
 FACTCHECK_TIMEOUT = float(os.getenv("FACTCHECK_TIMEOUT", "8.0"))
 MAX_RETRIES = int(os.getenv("FACTCHECK_MAX_RETRIES", "3"))
-DELAY_BETWEEN_CALLS = float(os.getenv("FACTCHECK_DELAY", "0.5"))
+FACTCHECK_QPS = float(os.getenv("FACTCHECK_QPS", "5"))  # Average API calls per second, per process
+FACTCHECK_BURST = int(os.getenv("FACTCHECK_BURST", "10"))  # Calls allowed back to back before limiting
+FACTCHECK_MAX_WORKERS = int(os.getenv("FACTCHECK_MAX_WORKERS", "8"))
+FACTCHECK_CACHE_TTL = int(os.getenv("FACTCHECK_CACHE_TTL", str(24 * 3600)))  # 1 day
+MAX_CLAIMS = 20  # Candidate claims per document, to avoid excessive API calls
+
+# Checkable claims carry a number or a named entity (two capitalized words in
+# a row); text with neither is not worth tokenizing or sending to the API
+_CLAIM_HINT_RE = re.compile(r"\d|[A-Z][a-z]+ [A-Z][a-z]+")
+
+# Sentences opening with these (lowercased) point at figures, references or
+# examples rather than stating a claim
+_NON_CLAIM_PREFIXES = (
+    'figure', 'table', 'see', 'cf.', 'e.g.', 'i.e.',
+    'references', 'bibliography', 'acknowledgments',
+)
+
+# Query cleanup: control characters, quotes and brackets are dropped in one
+# pass. ASCII claims use str.translate (control characters that str.split()
+# treats as whitespace become spaces so the words around them stay apart);
+# translate is slow on non-ASCII text, so those claims use the regex instead
+_QUERY_DROP_TABLE = {i: ' ' if chr(i).isspace() else None for i in [*range(0x20), 0x7f]}
+_QUERY_DROP_TABLE.update(dict.fromkeys(map(ord, '"\'[]{}()<>`')))
+_QUERY_DROP_RE = re.compile(r'[\x00-\x1f\x7f-\x9f"\'\[\]{}()<>«»`]')
+_REPEATED_TERMINALS_RE = re.compile(r'[.!?]{2,}')
+_REPEATED_SEPARATORS_RE = re.compile(r'[,;:]{2,}')
+
+
+def _create_session() -> requests.Session:
+    """Create an HTTP session that keeps connections to the Fact Check API alive."""
+    session = requests.Session()
+    
+    # One pooled connection per worker; retries are handled by the callers
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(10, FACTCHECK_MAX_WORKERS))
+    session.mount("https://", adapter)
+    
+    return session
+
+# Shared across requests and worker threads so TCP/TLS connections are reused
+_SESSION = _create_session()
+
+
+# Service account client, built once per process. googleapiclient service
+# objects are not thread-safe, so every call on it holds _SERVICE_LOCK.
+_SERVICE = None
+_SERVICE_LOCK = threading.Lock()
+
+# Shared by all requests and worker threads so the process as a whole stays
+# under the API quota; bursts go through without waiting
+_RATE_LIMITER = RateLimiter(FACTCHECK_QPS, burst=FACTCHECK_BURST)
 
 
 def _clean_query_for_factcheck(claim: str, max_len: int = 120) -> str:
@@ -38,21 +86,18 @@ def _clean_query_for_factcheck(claim: str, max_len: int = 120) -> str:
     if not claim or not claim.strip():
         return ""
     
-    # Remove newlines and normalize whitespace
-    cleaned = " ".join(claim.split())
-    
-    # Remove control characters and non-printable characters
-    cleaned = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', cleaned)
-    
-    # Remove problematic punctuation and quotes
-    # Keep basic punctuation but remove quotes, brackets, and other special chars
-    cleaned = re.sub(r'["\'\[\]{}()<>«»""''`]', '', cleaned)
+    # Remove control characters, quotes, brackets and other special chars
+    # (keeps basic punctuation)
+    if claim.isascii():
+        cleaned = claim.translate(_QUERY_DROP_TABLE)
+    else:
+        cleaned = _QUERY_DROP_RE.sub('', " ".join(claim.split()))
     
     # Remove excessive punctuation (multiple consecutive punctuation marks)
-    cleaned = re.sub(r'[.!?]{2,}', '.', cleaned)
-    cleaned = re.sub(r'[,;:]{2,}', ',', cleaned)
+    cleaned = _REPEATED_TERMINALS_RE.sub('.', cleaned)
+    cleaned = _REPEATED_SEPARATORS_RE.sub(',', cleaned)
     
-    # Clean up any remaining whitespace issues
+    # Remove newlines and normalize whitespace
     cleaned = " ".join(cleaned.split())
     
     if not cleaned:
@@ -91,29 +136,98 @@ def extract_claims(text: str) -> List[str]:
     Returns:
         List of candidate claim sentences (filtered for length and limited to 20)
     """
-    if not text:
+    if not text or not _CLAIM_HINT_RE.search(text):
         return []
     
     try:
-        # Split text into sentences using NLTK
-        sentences = nltk.tokenize.sent_tokenize(text)
-        
-        # Filter sentences that are likely to be claims
-        # Keep sentences longer than 40 characters to filter out short fragments
-        claims = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) > 40 and not _is_likely_non_claim(sentence):
-                claims.append(sentence)
-        
-        # Limit to first 20 candidate claims to avoid excessive API calls
-        return claims[:20]
+        # The same document (re-uploads, repeated fact-check requests) is
+        # only tokenized once; extraction errors are not cached
+        return get_or_set("claims", make_key(MAX_CLAIMS, text), lambda: _extract_claims(text))
         
     except Exception as e:
         logger.error(f"Error extracting claims: {e}")
         return []
 
 
+def _extract_claims(text: str) -> List[str]:
+    """Tokenize text and collect up to MAX_CLAIMS candidate claim sentences."""
+    # Filter sentences that are likely to be claims
+    # Keep sentences longer than 40 characters to filter out short fragments
+    claims = []
+    for sentence in _iter_sentences(text):
+        if len(sentence) <= 40:  # Can only get shorter when stripped
+            continue
+        
+        sentence = sentence.strip()
+        if len(sentence) > 40 and not _is_likely_non_claim(sentence):
+            claims.append(sentence)
+            
+            # Only the first few claims are checked, so stop splitting here
+            # instead of tokenizing the rest of the document
+            if len(claims) >= MAX_CLAIMS:
+                break
+    
+    return claims
+
+
+@lru_cache(maxsize=1)
+def _get_sentence_tokenizer():
+    """
+    Load the English Punkt model used by nltk.sent_tokenize, once per process.
+    
+    NLTK is imported (and the model downloaded if missing) here rather than
+    at module import, so processes that never extract claims skip both.
+    
+    Returns:
+        The tokenizer, or None if no Punkt model can be loaded (the outcome
+        is cached either way, so a missing model is not looked up per call)
+    """
+    import nltk
+    
+    # Download punkt tokenizer data if not already present
+    try:
+        nltk.data.find('tokenizers/punkt')
+    except LookupError:
+        nltk.download('punkt', quiet=True)
+    
+    try:
+        return nltk.data.load("tokenizers/punkt/english.pickle")
+    except Exception:
+        pass
+    
+    try:
+        # NLTK 3.8.2+ ships the model as punkt_tab instead of a pickle, and its
+        # sent_tokenize() would rebuild this tokenizer on every call
+        from nltk.tokenize.punkt import PunktTokenizer
+        return PunktTokenizer("english")
+    except Exception as e:
+        logger.warning(f"Punkt sentence tokenizer unavailable: {e}")
+        return None
+
+
+def _iter_sentences(text: str):
+    """
+    Yield the sentences of text one at a time using NLTK's Punkt tokenizer.
+    
+    Punkt finds sentence boundaries lazily, so callers that stop early skip
+    the rest of the document.
+    
+    Args:
+        text: Input text to split
+        
+    Yields:
+        Sentences in document order
+    """
+    tokenizer = _get_sentence_tokenizer()
+    if tokenizer is None:
+        from nltk.tokenize import sent_tokenize
+        yield from sent_tokenize(text)
+        return
+    
+    for start, end in tokenizer.span_tokenize(text):
+        yield text[start:end]
+
+
 def _is_likely_non_claim(sentence: str) -> bool:
     """
     Filter out sentences that are unlikely to be factual claims.
@@ -126,24 +240,32 @@ def _is_likely_non_claim(sentence: str) -> bool:
     """
     sentence_lower = sentence.lower().strip()
     
-    # Skip questions, references, citations, and other non-claim content
-    skip_patterns = [
-        sentence_lower.startswith(('figure', 'table', 'see', 'cf.', 'e.g.', 'i.e.')),
-        sentence_lower.endswith('?'),
-        '[' in sentence and ']' in sentence,  # likely citations
-        sentence_lower.startswith(('references', 'bibliography', 'acknowledgments')),
-        len(sentence.split()) < 5,  # very short sentences
-    ]
+    # Skip questions, references, citations, and other non-claim content;
+    # the checks stop at the first match, cheapest first
+    return (
+        sentence_lower.startswith(_NON_CLAIM_PREFIXES)
+        or sentence_lower.endswith('?')
+        or ('[' in sentence and ']' in sentence)  # likely citations
+        or len(sentence.split(maxsplit=4)) < 5  # very short sentences
+    )
+
+
+def _retry_delay(attempt: int) -> float:
+    """
+    Seconds to wait before retrying a failed Fact Check API call.
     
-    return any(skip_patterns)
+    Exponential backoff (0.5s, 1s, 2s, ... capped at 8s) with full jitter, so
+    workers that failed together do not all retry at the same moment.
+    """
+    return random.uniform(0, min(8.0, 0.5 * 2 ** (attempt - 1)))
 
 
-def _call_google_factcheck_rest(query: str) -> Dict:
+def _call_google_factcheck_rest(cleaned_query: str) -> Dict:
     """
     Call Google Fact Check Tools API using REST API with API key.
     
     Args:
-        query: Claim text to fact-check
+        cleaned_query: Claim text already cleaned by _clean_query_for_factcheck
         
     Returns:
         API response as dictionary
@@ -156,56 +278,96 @@ def _call_google_factcheck_rest(query: str) -> Dict:
     if not api_key:
         raise RuntimeError("GOOGLE_API_KEY not configured")
     
-    # Clean the query to prevent API errors
-    cleaned_query = _clean_query_for_factcheck(query)
-    if not cleaned_query:
-        return {"claims": []}  # Return empty result for invalid queries
-    
     url = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
     params = {"query": cleaned_query, "key": api_key}
     
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            response = requests.get(url, params=params, timeout=FACTCHECK_TIMEOUT)
+            response = _SESSION.get(url, params=params, timeout=FACTCHECK_TIMEOUT)
             response.raise_for_status()
             return response.json()
         except Exception as e:
             logger.warning(f"Factcheck REST API error attempt {attempt}/{MAX_RETRIES}: {e}")
             if attempt < MAX_RETRIES:
-                time.sleep(0.5 * attempt)  # exponential backoff
+                time.sleep(_retry_delay(attempt))
             else:
                 raise
 
 
-def _call_google_factcheck_service_account(service, query: str) -> Dict:
+def _call_google_factcheck_service_account(service, cleaned_query: str) -> Dict:
     """
     Call Google Fact Check Tools API using service account credentials.
     
     Args:
         service: Google API service client
-        query: Claim text to fact-check
+        cleaned_query: Claim text already cleaned by _clean_query_for_factcheck
         
     Returns:
         API response as dictionary
     """
-    # Clean the query to prevent API errors
-    cleaned_query = _clean_query_for_factcheck(query)
-    if not cleaned_query:
-        return {"claims": []}  # Return empty result for invalid queries
-    
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            request = service.claims().search(query=cleaned_query)
-            response = request.execute()
+            with _SERVICE_LOCK:
+                request = service.claims().search(query=cleaned_query)
+                response = request.execute()
             return response
         except Exception as e:
             logger.warning(f"Factcheck service account API error attempt {attempt}/{MAX_RETRIES}: {e}")
             if attempt < MAX_RETRIES:
-                time.sleep(0.5 * attempt)
+                time.sleep(_retry_delay(attempt))
             else:
                 raise
 
 
+def _get_factcheck_service():
+    """
+    Get the process-wide Fact Check API client for service account authentication.
+    
+    The credentials file is read and the client built on first use, not on
+    every fact_check_claims call. Calls on the client must hold _SERVICE_LOCK.
+    
+    Returns:
+        Google API service client
+    """
+    global _SERVICE
+    
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            from google.oauth2 import service_account
+            from googleapiclient.discovery import build
+            
+            credentials = service_account.Credentials.from_service_account_file(GOOGLE_SERVICE_ACCOUNT_FILE)
+            _SERVICE = build("factchecktools", "v1alpha1", credentials=credentials, cache_discovery=False)
+    
+    return _SERVICE
+
+
+def _batch_factcheck_service_account(service, queries: List[str]) -> List:
+    """
+    Search several claims with one batched HTTP request to the Fact Check API.
+    
+    Args:
+        service: Google API service client
+        queries: Cleaned claim queries
+        
+    Returns:
+        One entry per query, in order: the API response dictionary, or the
+        exception raised for that query
+    """
+    responses = {}
+    
+    def on_response(request_id, response, exception):
+        responses[request_id] = exception if exception is not None else response
+    
+    with _SERVICE_LOCK:
+        batch = service.new_batch_http_request(callback=on_response)
+        for i, query in enumerate(queries):
+            batch.add(service.claims().search(query=query), request_id=str(i))
+        batch.execute()
+    
+    return [responses.get(str(i), RuntimeError("No response in batch")) for i in range(len(queries))]
+
+
 def fact_check_claims(claims: List[str]) -> List[Dict]:
     """
     Fact-check a list of claims using Google Fact Check Tools API.
@@ -259,11 +421,7 @@ def fact_check_claims(claims: List[str]) -> List[Dict]:
     
     if use_service_account:
         try:
-            from google.oauth2 import service_account
-            from googleapiclient.discovery import build
-            
-            credentials = service_account.Credentials.from_service_account_file(GOOGLE_SERVICE_ACCOUNT_FILE)
-            service = build("factchecktools", "v1alpha1", credentials=credentials, cache_discovery=False)
+            service = _get_factcheck_service()
             call_mode = "service_account"
             print("✅ Using Google Fact Check API with service account authentication")
             logger.info("Using service account authentication for fact-checking")
@@ -288,57 +446,116 @@ def fact_check_claims(claims: List[str]) -> List[Dict]:
         print("✅ Using Google Fact Check API with API key authentication")
         logger.info("Using API key authentication for fact-checking")
     
-    # Process each claim
-    for i, claim in enumerate(claims):
-        # Add delay between API calls to avoid rate limiting
-        if i > 0:
-            time.sleep(DELAY_BETWEEN_CALLS)
-        
-        # Check if claim can be cleaned for API call
-        cleaned_claim = _clean_query_for_factcheck(claim)
-        if not cleaned_claim:
-            results.append({
-                "claim": claim,
-                "status": "not_configured",
-                "fact_checks": [],
-                "error": "Claim could not be processed (too short or invalid after cleaning)"
-            })
-            continue
+    # Each claim is cleaned once; the cleaned text is what gets sent to the API.
+    # Repeated sentences (e.g. abstract and conclusion), and sentences that
+    # only differ in quoting or punctuation, share one query and one check
+    cleaned_claims = {claim: _clean_query_for_factcheck(claim) for claim in claims}
+    queries = list(dict.fromkeys(query for query in cleaned_claims.values() if query))
+    
+    # With a service account, queries missing from the cache are searched in a
+    # single batched HTTP request; queries whose batch entry failed are
+    # retried one by one below
+    batched = {}
+    if call_mode == "service_account" and service:
+        pending = [query for query in queries if cache_get("fact_check", make_key(query)) is None]
+        if pending:
+            try:
+                _RATE_LIMITER.acquire()
+                batched = dict(zip(pending, _batch_factcheck_service_account(service, pending)))
+            except Exception as e:
+                logger.warning(f"Factcheck batch request failed, checking claims one by one: {e}")
+    
+    def check_query(query: str) -> Dict:
+        """Fact-check one cleaned query against the API (raises on API errors)."""
+        response = batched.get(query)
         
-        try:
-            # Call appropriate API method
+        # Call appropriate API method unless the batch already answered
+        if not isinstance(response, dict):
+            _RATE_LIMITER.acquire()
             if call_mode == "service_account" and service:
-                response = _call_google_factcheck_service_account(service, claim)
+                response = _call_google_factcheck_service_account(service, query)
             else:
-                response = _call_google_factcheck_rest(claim)
-            
-            # Extract fact-check data from response
-            fact_checks = response.get("claims", []) if isinstance(response, dict) else []
-            
-            # Determine status based on fact-check results
-            status = _determine_fact_check_status(fact_checks)
-            
-            results.append({
-                "claim": claim,
-                "status": status,
-                "fact_checks": fact_checks,
-                "error": None
-            })
+                response = _call_google_factcheck_rest(query)
+        
+        # Extract fact-check data from response
+        fact_checks = response.get("claims", []) if isinstance(response, dict) else []
+        
+        # Determine status based on fact-check results
+        status = _determine_fact_check_status(fact_checks)
+        
+        return {
+            "status": status,
+            "fact_checks": fact_checks,
+            "error": None
+        }
+    
+    def process_query(query: str) -> Dict:
+        """Produce the status, fact-checks and error for one cleaned query."""
+        try:
+            # Queries repeated across documents or re-uploads are served from
+            # the cache without an API call; errors are never cached
+            result = get_or_set(
+                "fact_check", make_key(query), lambda: check_query(query), ttl=FACTCHECK_CACHE_TTL
+            )
             
-            logger.debug(f"Fact-checked claim: {claim[:50]}... -> {status}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Fact-checked claim: %s... -> %s", query[:50], result['status'])
+            return result
             
         except Exception as e:
-            logger.exception(f"Fact check API error for claim: {claim[:50]}...")
-            results.append({
-                "claim": claim,
+            logger.exception(f"Fact check API error for claim: {query[:50]}...")
+            return {
                 "status": "api_error",
                 "fact_checks": [],
                 "error": str(e)
+            }
+    
+    # Process queries concurrently; calls on the shared service account client
+    # are serialized by _SERVICE_LOCK, so those stay sequential
+    results_by_query = {}
+    if queries:
+        max_workers = 1 if call_mode == "service_account" and service else FACTCHECK_MAX_WORKERS
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+            results_by_query = dict(zip(queries, executor.map(process_query, queries)))
+    
+    for claim in claims:
+        query = cleaned_claims[claim]
+        
+        # Check if claim can be cleaned for API call
+        if not query:
+            results.append({
+                "claim": claim,
+                "status": "not_configured",
+                "fact_checks": [],
+                "error": "Claim could not be processed (too short or invalid after cleaning)"
             })
-
+            continue
+        
+        result = results_by_query[query]
+        results.append({
+            "claim": claim,
+            "status": result["status"],
+            "fact_checks": result["fact_checks"],
+            "error": result["error"]
+        })
+    
     return results
 
 
+def fact_check_text(text: str) -> List[Dict]:
+    """
+    Extract factual claims from text and fact-check them.
+    
+    Args:
+        text: Document text
+        
+    Returns:
+        List of fact-check results (empty if no claims were found)
+    """
+    claims = extract_claims(text)
+    return fact_check_claims(claims) if claims else []
+
+
 def _determine_fact_check_status(fact_checks: List[Dict]) -> str:
     """
     Determine overall fact-check status based on claim reviews.
@@ -374,6 +591,30 @@ def _determine_fact_check_status(fact_checks: List[Dict]) -> str:
     return "no_verdict"
 
 
+# Mock data used when no Fact Check API credentials are configured; sources
+# are paired with the slug used for their mock site and URLs
+_MOCK_SOURCES = [
+    (name, name.lower().replace(" ", "").replace(".", ""))
+    for name in (
+        "FactCheck.org", "Snopes", "PolitiFact", "Reuters Fact Check", 
+        "AP Fact Check", "BBC Reality Check", "Washington Post Fact Checker"
+    )
+]
+
+_MOCK_VERDICTS = [
+    {"status": "verified", "rating": "True", "explanation": "This claim is supported by credible sources and evidence."},
+    {"status": "contradicted", "rating": "False", "explanation": "This claim contradicts established facts and reliable sources."},
+    {"status": "no_verdict", "rating": "Unproven", "explanation": "Insufficient evidence to verify or contradict this claim."},
+    {"status": "verified", "rating": "Mostly True", "explanation": "This claim is largely accurate with minor inaccuracies."},
+    {"status": "contradicted", "rating": "Mostly False", "explanation": "This claim contains significant inaccuracies."},
+]
+_MOCK_VERDICT_WEIGHTS = [0.15, 0.15, 0.5, 0.1, 0.1]  # More no_verdict results
+
+# Number of mock fact-checks per claim (sometimes several)
+_MOCK_CHECK_COUNTS = [0, 1, 2]
+_MOCK_CHECK_COUNT_WEIGHTS = [0.4, 0.4, 0.2]
+
+
 def _generate_mock_fact_check_results(claims: List[str]) -> List[Dict]:
     """
     Generate mock fact-check results for testing when API keys are not available.
@@ -388,40 +629,27 @@ def _generate_mock_fact_check_results(claims: List[str]) -> List[Dict]:
     logger.info("Using mock fact-check data - no Google Fact Check API key found")
     
     mock_results = []
-    mock_sources = [
-        "FactCheck.org", "Snopes", "PolitiFact", "Reuters Fact Check", 
-        "AP Fact Check", "BBC Reality Check", "Washington Post Fact Checker"
-    ]
-    
-    mock_verdicts = [
-        {"status": "verified", "rating": "True", "explanation": "This claim is supported by credible sources and evidence."},
-        {"status": "contradicted", "rating": "False", "explanation": "This claim contradicts established facts and reliable sources."},
-        {"status": "no_verdict", "rating": "Unproven", "explanation": "Insufficient evidence to verify or contradict this claim."},
-        {"status": "verified", "rating": "Mostly True", "explanation": "This claim is largely accurate with minor inaccuracies."},
-        {"status": "contradicted", "rating": "Mostly False", "explanation": "This claim contains significant inaccuracies."},
-    ]
     
     for claim in claims:
         # Randomly assign verdict (weighted toward no_verdict for realism)
-        verdict_weights = [0.15, 0.15, 0.5, 0.1, 0.1]  # More no_verdict results
-        verdict = random.choices(mock_verdicts, weights=verdict_weights)[0]
+        verdict = random.choices(_MOCK_VERDICTS, weights=_MOCK_VERDICT_WEIGHTS)[0]
         
         # Generate mock fact-check data
         fact_checks = []
         
         # Sometimes generate multiple fact-checks for a claim
-        num_checks = random.choices([0, 1, 2], weights=[0.4, 0.4, 0.2])[0]
+        num_checks = random.choices(_MOCK_CHECK_COUNTS, weights=_MOCK_CHECK_COUNT_WEIGHTS)[0]
         
         for i in range(num_checks):
-            source = random.choice(mock_sources)
+            source, slug = random.choice(_MOCK_SOURCES)
             fact_check = {
                 "text": claim[:100] + "..." if len(claim) > 100 else claim,
                 "claimReview": [{
                     "publisher": {
                         "name": source,
-                        "site": source.lower().replace(" ", "").replace(".", "") + ".com"
+                        "site": f"{slug}.com"
                     },
-                    "url": f"https://{source.lower().replace(' ', '').replace('.', '')}.com/factcheck/{random.randint(1000, 9999)}",
+                    "url": f"https://{slug}.com/factcheck/{random.randint(1000, 9999)}",
                     "title": f"Fact Check: {claim[:50]}{'...' if len(claim) > 50 else ''}",
                     "reviewRating": {
                         "ratingValue": verdict["rating"],
@@ -433,7 +661,7 @@ def _generate_mock_fact_check_results(claims: List[str]) -> List[Dict]:
                     },
                     "datePublished": "2024-01-01"
                 }],
-                "url": f"https://{source.lower().replace(' ', '').replace('.', '')}.com/factcheck/{random.randint(1000, 9999)}"
+                "url": f"https://{slug}.com/factcheck/{random.randint(1000, 9999)}"
             }
             fact_checks.append(fact_check)
         
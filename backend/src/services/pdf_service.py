@@ -1,6 +1,76 @@
 import fitz  # PyMuPDF
+import os
 import re
 import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Large PDFs can be split across worker processes (PyMuPDF is not thread-safe
+# and holds the GIL while parsing); 0 or 1 extracts every PDF in-process
+PDF_EXTRACT_PROCESSES = int(os.getenv("PDF_EXTRACT_PROCESSES", "0"))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "50"))
+
+# Section headers that can't be a paper's title
+_TITLE_SKIP_PREFIXES = ('abstract', 'references', 'introduction', 'keywords')
+
+_REFERENCES_HEADER_RE = re.compile(r'\b(?:references|bibliography|works\s+cited)\b', re.IGNORECASE)
+
+# Worker processes are started on first use and kept for later documents
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Get (or start) the pool of PDF extraction processes."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawned rather than forked: forking a threaded server process
+            # (or one holding the summarizer model) is unsafe
+            _executor = ProcessPoolExecutor(
+                max_workers=PDF_EXTRACT_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+def _extract_page_range(source: str | bytes, start: int, stop: int) -> list[str]:
+    """Extract the text of pages [start, stop) of a PDF (runs in a worker process)."""
+    if isinstance(source, (bytes, bytearray)):
+        doc = fitz.open(stream=source, filetype="pdf")
+    else:
+        doc = fitz.open(source)
+    
+    with doc:
+        return [doc[i].get_text("text") for i in range(start, stop)]
+
+def _extract_page_texts(doc, source: str | bytes) -> list[str]:
+    """
+    Extract the text of every page of an open PDF, in document order.
+    
+    Documents with at least PDF_PARALLEL_MIN_PAGES pages are split into page
+    ranges extracted by PDF_EXTRACT_PROCESSES worker processes, when enabled.
+    
+    Args:
+        doc: Open PyMuPDF document
+        source: Path or contents the document was opened from (workers reopen it)
+        
+    Returns:
+        List with the text of each page
+    """
+    page_count = doc.page_count
+    if PDF_EXTRACT_PROCESSES > 1 and page_count >= PDF_PARALLEL_MIN_PAGES:
+        step = -(-page_count // PDF_EXTRACT_PROCESSES)  # Ceiling division
+        try:
+            executor = _get_executor()
+            futures = [
+                executor.submit(_extract_page_range, source, start, min(start + step, page_count))
+                for start in range(0, page_count, step)
+            ]
+            return [text for future in futures for text in future.result()]
+        except Exception as e:
+            logging.warning(f"Parallel PDF extraction failed, extracting in-process: {e}")
+    
+    return [page.get_text("text") for page in doc]
 
 def extract_text_from_pdf(file_path: str) -> str:
     """
@@ -13,40 +83,34 @@ def extract_text_from_pdf(file_path: str) -> str:
         Extracted text as a single string with extra whitespace stripped
     """
     try:
-        doc = fitz.open(file_path)
-        text = ""
-        
-        # Extract text from all pages in order
-        for page in doc:
-            page_text = page.get_text("text")
-            if page_text.strip():  # Only add non-empty pages
-                text += page_text + "\n"
-        
-        doc.close()
+        # Collect page texts and join once instead of growing a string per page
+        with fitz.open(file_path) as doc:
+            page_texts = _extract_page_texts(doc, file_path)
         
-        # Strip extra whitespace and return
-        return text.strip()
+        # Only keep non-empty pages, strip extra whitespace and return
+        return "\n".join(t for t in page_texts if t.strip()).strip()
         
     except Exception as e:
         logging.error(f"Failed to extract text from PDF {file_path}: {str(e)}")
         raise Exception(f"Failed to extract text from PDF: {str(e)}")
 
-def extract_text_and_meta(path: str) -> tuple[str, int, str|None]:
+def extract_text_and_meta(source: str | bytes) -> tuple[str, int, str|None]:
     """
     Extract text and metadata from PDF file.
     
+    Args:
+        source: Path to the PDF file, or its contents (parsed in memory)
+    
     Returns:
         tuple: (text, word_count, title)
     """
     try:
-        doc = fitz.open(path)
-        text = ""
-        
-        # Extract text from all pages
-        for page in doc:
-            text += page.get_text("text") + "\n"
-        
-        text = text.strip()
+        if isinstance(source, (bytes, bytearray)):
+            doc = fitz.open(stream=source, filetype="pdf")
+        else:
+            doc = fitz.open(source)
+        # Extract text from all pages, joined once instead of growing a string per page
+        text = "\n".join(_extract_page_texts(doc, source)).strip()
         
         # Count words
         word_count = len(text.split()) if text else 0
@@ -59,15 +123,16 @@ def extract_text_and_meta(path: str) -> tuple[str, int, str|None]:
         if metadata_title and len(metadata_title) > 0:
             title = metadata_title
         else:
-            # Try to extract from first few lines
-            lines = text.split('\n')[:10]  # Check first 10 lines
+            # Try to extract from first few lines; split off only the first
+            # 10 instead of splitting the whole document into lines
+            lines = text.split('\n', 10)[:10]
             for line in lines:
                 line = line.strip()
                 # Skip empty lines, abstract headers, etc.
                 if (line and 
                     len(line) > 10 and 
                     len(line) < 200 and
-                    not line.lower().startswith(('abstract', 'references', 'introduction', 'keywords'))):
+                    not line.lower().startswith(_TITLE_SKIP_PREFIXES)):
                     title = line
                     break
         
@@ -80,8 +145,7 @@ def extract_text_and_meta(path: str) -> tuple[str, int, str|None]:
 def extract_references_section(text: str) -> str:
     """Extract the references section from the document text."""
     # Find references section (case insensitive)
-    references_pattern = r'\b(?:references|bibliography|works\s+cited)\b'
-    match = re.search(references_pattern, text, re.IGNORECASE)
+    match = _REFERENCES_HEADER_RE.search(text)
     
     if match:
         # Return text from references section onwards
@@ -1,16 +1,75 @@
 import os
 import glob
 import logging
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import joblib
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+from sklearn.feature_extraction.text import HashingVectorizer
 from flask import current_app
 
-def check_plagiarism(text: str) -> dict:
+# Stateless vectorizer: hashes unigrams and bigrams straight into a fixed
+# feature space, so no vocabulary has to be built for every request
+_HASHER = HashingVectorizer(
+    n_features=2**18,
+    stop_words='english',
+    lowercase=False,  # Callers pass lowercased text
+    ngram_range=(1, 2),  # Include unigrams and bigrams
+    alternate_sign=False,
+    norm=None  # Raw term counts; TF-IDF weighting is applied afterwards
+)
+
+# Hashed corpus term frequencies and their document frequencies per corpus
+# directory (see _index_corpus), reused across requests until a corpus file
+# is added, removed or modified
+_corpus_cache = {}
+
+# Guards corpus loading when several requests check plagiarism at once
+_corpus_lock = threading.Lock()
+
+# Threads reading corpus files in parallel (file reads release the GIL)
+CORPUS_READ_WORKERS = 16
+
+# Hashed corpus saved inside the corpus directory, so restarted workers skip
+# re-reading and re-hashing every file while the corpus is unchanged
+CORPUS_INDEX_FILE = os.path.join('.cache', 'corpus_index.joblib')
+
+# Corpus documents whose 64-bit SimHashes differ in at most this many bits
+# are near-duplicates (e.g. a preprint and its published version); only the
+# first one is kept. A negative value keeps every document. Distances above
+# 3 can't use the banded lookup and compare every pair of documents on load.
+CORPUS_DUPLICATE_DISTANCE = int(os.getenv("CORPUS_DUPLICATE_DISTANCE", "3"))
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """Mix 64-bit integers into well-distributed pseudo-random bits (SplitMix64)."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+# Random 64-bit pattern of every hashed feature, for SimHash (the same in
+# every process, unlike hash())
+_FEATURE_BITS = _splitmix64(np.arange(_HASHER.n_features, dtype=np.uint64))
+
+# Which of the 4 bits of each nibble value (0-15) are set
+_NIBBLE_BITS = ((np.arange(16)[:, None] >> np.arange(4)) & 1).astype(float)
+
+# Number of set bits in each byte value, for counting bits across arrays
+_BYTE_POPCOUNTS = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+# Near-duplicates up to this many bits apart are found through SimHash bands
+# (see _unique_documents); larger distances compare every pair of documents
+_BANDED_MAX_DISTANCE = 3
+
+def check_plagiarism(text: str, text_lower: str = None) -> dict:
     """
     Check plagiarism using TF-IDF and cosine similarity against local database.
     
     Args:
         text: Document text to check
+        text_lower: text.lower(), if the caller already computed it
         
     Returns:
         Dictionary with plagiarism_score and matching_sources
@@ -19,42 +78,24 @@ def check_plagiarism(text: str) -> dict:
         return {"plagiarism_score": 0.0, "matching_sources": []}
     
     # Load corpus files
-    corpus_texts, corpus_files = _load_corpus_with_filenames()
+    corpus_files, corpus_index = _get_corpus()
     
-    if not corpus_texts:
+    if not corpus_files:
         logging.warning("No corpus files found, returning 0.0 plagiarism score")
         return {"plagiarism_score": 0.0, "matching_sources": []}
     
     try:
-        # Prepare documents for comparison
-        documents = [text] + corpus_texts
-        
-        # Create TF-IDF vectorizer
-        vectorizer = TfidfVectorizer(
-            stop_words='english',
-            lowercase=True,
-            max_df=0.9,  # Ignore terms that appear in >90% of docs
-            min_df=1,    # Include terms that appear in at least 1 doc
-            ngram_range=(1, 2)  # Include unigrams and bigrams
-        )
-        
-        # Fit and transform documents
-        tfidf_matrix = vectorizer.fit_transform(documents)
-        
-        # Calculate cosine similarity between uploaded doc (index 0) and corpus docs
-        similarity_scores = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:])
-        
-        # Get all similarity scores with their corresponding files
-        matching_sources = []
-        for i, score in enumerate(similarity_scores[0]):
-            if score > 0.1:  # Only include meaningful matches
-                matching_sources.append({
-                    "file": corpus_files[i],
-                    "score": float(round(score, 3))
-                })
-        
-        # Sort by score (highest first)
-        matching_sources.sort(key=lambda x: x["score"], reverse=True)
+        # Calculate cosine similarity between uploaded doc and corpus docs
+        similarity_scores = _similarity_scores(text_lower or text.lower(), corpus_index)
+        
+        # Only include meaningful matches, sorted by rounded score (highest
+        # first, ties in corpus order) without building entries for the rest
+        rounded_scores = np.round(similarity_scores, 3)
+        matches = _top_matches(rounded_scores, np.flatnonzero(similarity_scores > 0.1), 10)
+        matching_sources = [
+            {"file": corpus_files[i], "score": float(rounded_scores[i])}
+            for i in matches
+        ]
         
         # Get maximum similarity score as overall plagiarism score
         max_similarity = similarity_scores.max() if similarity_scores.size > 0 else 0.0
@@ -62,19 +103,20 @@ def check_plagiarism(text: str) -> dict:
         
         return {
             "plagiarism_score": plagiarism_score,
-            "matching_sources": matching_sources[:10]  # Top 10 matches
+            "matching_sources": matching_sources  # Top 10 matches
         }
         
     except Exception as e:
         logging.error(f"Error in plagiarism detection: {e}")
         return {"plagiarism_score": 0.0, "matching_sources": []}
 
-def check(text: str) -> float:
+def check(text: str, text_lower: str = None) -> float:
     """
     Check plagiarism score against local corpus using TF-IDF similarity.
     
     Args:
         text: Document text to check
+        text_lower: text.lower(), if the caller already computed it
     
     Returns:
         Plagiarism score as percentage (0.0-100.0)
@@ -83,30 +125,15 @@ def check(text: str) -> float:
         return 0.0
     
     # Load corpus files
-    corpus_texts = _load_corpus()
+    corpus_files, corpus_index = _get_corpus()
     
-    if not corpus_texts:
+    if not corpus_files:
         print("Warning: No corpus files found, returning 0.0 plagiarism score")
         return 0.0
     
     try:
-        # Prepare documents for comparison
-        documents = [text] + corpus_texts
-        
-        # Create TF-IDF vectorizer
-        vectorizer = TfidfVectorizer(
-            stop_words='english',
-            lowercase=True,
-            max_df=0.9,  # Ignore terms that appear in >90% of docs
-            min_df=1,    # Include terms that appear in at least 1 doc
-            ngram_range=(1, 2)  # Include unigrams and bigrams
-        )
-        
-        # Fit and transform documents
-        tfidf_matrix = vectorizer.fit_transform(documents)
-        
-        # Calculate cosine similarity between uploaded doc (index 0) and corpus docs
-        similarity_scores = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:])
+        # Calculate cosine similarity between uploaded doc and corpus docs
+        similarity_scores = _similarity_scores(text_lower or text.lower(), corpus_index)
         
         # Get maximum similarity score
         max_similarity = similarity_scores.max() if similarity_scores.size > 0 else 0.0
@@ -120,59 +147,334 @@ def check(text: str) -> float:
         print(f"Error in plagiarism detection: {e}")
         return 0.0
 
-def _load_corpus_with_filenames() -> tuple[list[str], list[str]]:
-    """Load all .txt files from the corpus directory with filenames."""
-    corpus_texts = []
-    corpus_files = []
-    corpus_dir = current_app.config.get('CORPUS_DIR', 'corpus')
+def _top_matches(scores: np.ndarray, candidates: np.ndarray, k: int) -> np.ndarray:
+    """
+    Select the k highest-scoring candidates, highest first.
     
-    if not os.path.exists(corpus_dir):
-        logging.warning(f"Corpus directory {corpus_dir} does not exist")
-        return corpus_texts, corpus_files
+    Candidates are partitioned around the k-th best score and only the
+    selected ones are sorted. Equal scores keep corpus order, including at
+    the cut-off, so the result matches a stable sort of every candidate.
+    
+    Args:
+        scores: Score of every corpus document
+        candidates: Indices of the documents to rank, in ascending order
+        k: Number of documents to return
+        
+    Returns:
+        Indices of up to k documents, sorted by score
+    """
+    if candidates.size > k:
+        candidate_scores = scores[candidates]
+        cutoff = np.partition(candidate_scores, -k)[-k]
+        above = candidates[candidate_scores > cutoff]
+        at_cutoff = candidates[candidate_scores == cutoff][:k - above.size]
+        candidates = np.sort(np.concatenate([above, at_cutoff]))
+    
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+def _similarity_scores(text_lower: str, corpus_index: dict) -> np.ndarray:
+    """
+    Compute TF-IDF cosine similarity between a document and each corpus text.
+    
+    Scores are the same as fitting TF-IDF on the document plus the corpus for
+    every request, but only the document is hashed and weighted here: the
+    corpus side was precomputed when it was loaded (see _index_corpus).
+    
+    Args:
+        text_lower: Lowercased document text to check
+        corpus_index: Precomputed corpus weights (see _get_corpus)
+        
+    Returns:
+        1-D array with one similarity score (0.0-1.0) per corpus document
+    """
+    query = _log_tf(_HASHER.transform([text_lower]))
+    columns, query_tf = query.indices, query.data
+    scores = np.zeros(corpus_index["tf"].shape[0])
+    
+    # The uploaded document counts towards the document frequency of its own
+    # terms, which changes their IDF weight in the corpus documents as well
+    n_docs = corpus_index["tf"].shape[0] + 1
+    corpus_idf = _idf(corpus_index["df"][columns], n_docs)
+    query_idf = _idf(corpus_index["df"][columns] + 1, n_docs)
+    
+    query_norm = np.sqrt(np.sum((query_tf * query_idf) ** 2))
+    if query_norm == 0:
+        return scores
+    
+    # Correct the precomputed squared norms of the corpus documents for the
+    # document's terms, then take the dot products with the document. Both
+    # are single sparse matrix-vector products over the corpus.
+    weights = np.zeros(query.shape[1])
+    weights[columns] = query_idf ** 2 - corpus_idf ** 2
+    corpus_norms = np.sqrt(np.maximum(corpus_index["norms_sq"] + corpus_index["tf_sq"] @ weights, 0))
+    
+    weights[columns] = query_tf * query_idf ** 2
+    dot_products = corpus_index["tf"] @ weights
+    
+    # Documents left without weighted terms score 0, as normalizing a zero
+    # row leaves it at zero
+    np.divide(dot_products, corpus_norms * query_norm, out=scores, where=corpus_norms > 0)
+    return scores
+
+def _log_tf(counts):
+    """Return log-scaled term frequencies (1 + log(tf)) for hashed term counts, so a few heavily repeated terms don't dominate."""
+    tf = counts.tocsr(copy=True)
+    np.log(tf.data, out=tf.data)
+    tf.data += 1
+    return tf
+
+def _idf(document_frequency: np.ndarray, n_docs: int) -> np.ndarray:
+    """Return smoothed IDF weights (as TfidfTransformer computes them), zeroed for terms that appear in >90% of docs."""
+    idf = np.log((1 + n_docs) / (1 + document_frequency)) + 1
+    idf[document_frequency > 0.9 * n_docs] = 0
+    return idf
+
+def _index_corpus(tf) -> dict:
+    """
+    Precompute the corpus side of the TF-IDF cosine similarity.
+    
+    Args:
+        tf: Log-scaled term frequencies of the corpus documents (see _log_tf)
+        
+    Returns:
+        Dictionary with the term frequencies and their squares, the document
+        frequency of every hashed term, and each document's squared TF-IDF
+        norm for a query that shares no terms with it
+    """
+    # The squares share tf's sparsity pattern, so reuse its index arrays
+    # rather than storing a second copy of them
+    tf_sq = csr_matrix((tf.data ** 2, tf.indices, tf.indptr), shape=tf.shape)
+    document_frequency = np.bincount(tf.indices, minlength=tf.shape[1])
+    idf = _idf(document_frequency, tf.shape[0] + 1)
+    
+    return {"tf": tf, "tf_sq": tf_sq, "df": document_frequency, "norms_sq": tf_sq @ idf ** 2}
+
+def _simhashes(tf) -> np.ndarray:
+    """
+    Compute the 64-bit SimHash of each document.
+    
+    Every hashed feature votes on each bit with its term frequency, according
+    to its pseudo-random pattern in _FEATURE_BITS; a bit is set when the votes
+    for 1 outweigh those for 0. Votes are tallied 4 bits at a time, by nibble
+    value, instead of once per bit.
+    
+    Args:
+        tf: Log-scaled term frequencies, one row per document (see _log_tf)
+        
+    Returns:
+        Array of uint64 SimHashes, one per document
+    """
+    n_docs = tf.shape[0]
+    bits = _FEATURE_BITS[tf.indices]
+    rows = np.repeat(np.arange(n_docs), np.diff(tf.indptr))
+    totals = np.bincount(rows, weights=tf.data, minlength=n_docs)
+    
+    simhashes = np.zeros(n_docs, dtype=np.uint64)
+    for nibble in range(16):
+        values = ((bits >> np.uint64(4 * nibble)) & np.uint64(15)).astype(np.intp)
+        weights = np.bincount(rows * 16 + values, weights=tf.data, minlength=n_docs * 16).reshape(n_docs, 16)
+        votes = (2 * (weights @ _NIBBLE_BITS) > totals[:, None]).astype(np.uint64)
+        simhashes |= (votes << np.arange(4 * nibble, 4 * nibble + 4, dtype=np.uint64)).sum(axis=1, dtype=np.uint64)
     
-    # Find all .txt files recursively
-    pattern = os.path.join(corpus_dir, '**', '*.txt')
-    txt_files = glob.glob(pattern, recursive=True)
+    return simhashes
+
+def _is_duplicate(simhash: int, simhashes) -> bool:
+    """Return True if simhash is within CORPUS_DUPLICATE_DISTANCE bits of any of simhashes."""
+    return any((simhash ^ other).bit_count() <= CORPUS_DUPLICATE_DISTANCE for other in simhashes)
+
+def _unique_documents(simhashes: np.ndarray) -> np.ndarray:
+    """
+    Find the documents that are not near-duplicates of an earlier one.
+    
+    For distances up to _BANDED_MAX_DISTANCE the SimHashes are split into
+    four 16-bit bands, and a document is only compared with earlier kept
+    documents that share a band with it; two SimHashes at most 3 bits apart
+    always share a band. Larger distances would slip past the bands, so each
+    document is then compared with every earlier kept one.
+    
+    Args:
+        simhashes: SimHash of each document, in corpus order
+        
+    Returns:
+        Boolean mask of the documents to keep
+    """
+    keep = np.ones(len(simhashes), dtype=bool)
+    if CORPUS_DUPLICATE_DISTANCE < 0:
+        return keep
+    
+    if CORPUS_DUPLICATE_DISTANCE > _BANDED_MAX_DISTANCE:
+        kept = np.zeros(len(simhashes), dtype=np.uint64)
+        n_kept = 0
+        for i, simhash in enumerate(simhashes):
+            distances = _BYTE_POPCOUNTS[(kept[:n_kept] ^ simhash).view(np.uint8)].reshape(-1, 8).sum(axis=1)
+            if (distances <= CORPUS_DUPLICATE_DISTANCE).any():
+                keep[i] = False
+            else:
+                kept[n_kept] = simhash
+                n_kept += 1
+        return keep
+    
+    bands = {}
+    for i, simhash in enumerate(simhashes.tolist()):
+        keys = [(band, (simhash >> (16 * band)) & 0xFFFF) for band in range(4)]
+        if _is_duplicate(simhash, (other for key in keys for other in bands.get(key, ()))):
+            keep[i] = False
+            continue
+        for key in keys:
+            bands.setdefault(key, []).append(simhash)
+    
+    return keep
+
+def _get_corpus() -> tuple[list[str], Optional[dict]]:
+    """
+    Get the corpus filenames and their precomputed TF-IDF weights.
     
+    The corpus is read and hashed once, then reused until one of its .txt
+    files is added, removed or modified.
+    
+    Returns:
+        Tuple of (filenames, corpus weights with one row per file, see
+        _index_corpus); the weights are None when the corpus is empty
+    """
+    corpus_dir = current_app.config.get('CORPUS_DIR', 'corpus')
+    
+    # Find all .txt files recursively; this one directory walk serves both
+    # the change check and the loading below
+    txt_files = glob.glob(os.path.join(corpus_dir, '**', '*.txt'), recursive=True)
+    
+    # Snapshot the corpus files before reading them, so a file changed while
+    # loading invalidates the cache on the next request
+    signature = []
     for file_path in txt_files:
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read().strip()
-                if len(content) > 100:  # Only include substantial texts
-                    corpus_texts.append(content)
-                    corpus_files.append(os.path.basename(file_path))
-        except Exception as e:
-            logging.error(f"Error reading corpus file {file_path}: {e}")
+            stat = os.stat(file_path)
+        except OSError:
             continue
+        signature.append((file_path, stat.st_mtime_ns, stat.st_size))
+    signature = tuple(sorted(signature))
     
-    logging.info(f"Loaded {len(corpus_texts)} corpus documents from {len(txt_files)} files")
-    return corpus_texts, corpus_files
+    with _corpus_lock:
+        cached = _corpus_cache.get(corpus_dir)
+        if cached is None or cached["signature"] != signature:
+            cached = _load_corpus_index(corpus_dir, signature)
+            if cached is None:
+                corpus_texts, corpus_files = _load_corpus_with_filenames(corpus_dir, txt_files)
+                cached = {"signature": signature, "files": [], "index": None, "simhashes": np.zeros(0, dtype=np.uint64)}
+                if corpus_texts:
+                    tf = _log_tf(_HASHER.transform([t.lower() for t in corpus_texts]))
+                    simhashes = _simhashes(tf)
+                    
+                    # Drop near-duplicate documents
+                    keep = _unique_documents(simhashes)
+                    if not keep.all():
+                        logging.info(f"Skipping {np.count_nonzero(~keep)} near-duplicate corpus documents")
+                    cached["files"] = [name for name, kept in zip(corpus_files, keep) if kept]
+                    cached["index"] = _index_corpus(tf[keep])
+                    cached["simhashes"] = simhashes[keep]
+                    _save_corpus_index(corpus_dir, cached)
+            _corpus_cache[corpus_dir] = cached
+    
+    return cached["files"], cached["index"]
+
+def _load_corpus_index(corpus_dir: str, signature: tuple) -> Optional[dict]:
+    """
+    Load the hashed corpus saved by an earlier process, if it is still current.
+    
+    Args:
+        corpus_dir: Corpus directory
+        signature: (path, mtime, size) of every corpus file right now
+        
+    Returns:
+        Corpus cache entry, or None if nothing was saved or the corpus files
+        (or the hashing settings) have changed since
+    """
+    index_path = os.path.join(corpus_dir, CORPUS_INDEX_FILE)
+    if not os.path.exists(index_path):
+        return None
+    
+    try:
+        saved = joblib.load(index_path)
+    except Exception as e:
+        logging.warning(f"Could not load saved corpus index {index_path}: {e}")
+        return None
+    
+    if (saved.get("signature") != signature or saved.get("hasher") != _HASHER.get_params()
+            or saved.get("duplicate_distance") != CORPUS_DUPLICATE_DISTANCE):
+        return None
+    
+    logging.info(f"Loaded {len(saved['files'])} hashed corpus documents from {index_path}")
+    return {
+        "signature": signature,
+        "files": saved["files"],
+        "index": _index_corpus(saved["tf"]),
+        "simhashes": saved["simhashes"]
+    }
 
-def _load_corpus() -> list[str]:
-    """Load all .txt files from the corpus directory."""
+def _save_corpus_index(corpus_dir: str, cached: dict) -> None:
+    """Save a freshly loaded corpus cache entry for _load_corpus_index."""
+    index_path = os.path.join(corpus_dir, CORPUS_INDEX_FILE)
+    
+    try:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        
+        # Write under a per-process name and rename it into place, so other
+        # workers never load a partially written file
+        temp_path = f"{index_path}.{os.getpid()}.tmp"
+        joblib.dump({
+            "signature": cached["signature"],
+            "hasher": _HASHER.get_params(),
+            "duplicate_distance": CORPUS_DUPLICATE_DISTANCE,
+            "files": cached["files"],
+            "tf": cached["index"]["tf"],
+            "simhashes": cached["simhashes"]
+        }, temp_path, compress=3)
+        os.replace(temp_path, index_path)
+    except Exception as e:
+        # The corpus still works from memory; the next process just rebuilds it
+        logging.warning(f"Could not save corpus index {index_path}: {e}")
+
+def _load_corpus_with_filenames(corpus_dir: str, txt_files: list[str]) -> tuple[list[str], list[str]]:
+    """
+    Load the corpus .txt files with their filenames.
+    
+    Args:
+        corpus_dir: Corpus directory
+        txt_files: Paths of the .txt files found under corpus_dir
+        
+    Returns:
+        Tuple of (texts, filenames) for the files with substantial text
+    """
     corpus_texts = []
-    corpus_dir = current_app.config.get('CORPUS_DIR', 'corpus')
+    corpus_files = []
     
     if not os.path.exists(corpus_dir):
-        print(f"Corpus directory {corpus_dir} does not exist")
-        return corpus_texts
+        logging.warning(f"Corpus directory {corpus_dir} does not exist")
+        return corpus_texts, corpus_files
     
-    # Find all .txt files recursively
-    pattern = os.path.join(corpus_dir, '**', '*.txt')
-    txt_files = glob.glob(pattern, recursive=True)
+    # Read files in parallel; loading is dominated by file I/O, not CPU
+    with ThreadPoolExecutor(max_workers=CORPUS_READ_WORKERS) as executor:
+        contents = list(executor.map(_read_corpus_file, txt_files))
     
-    for file_path in txt_files:
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read().strip()
-                if len(content) > 100:  # Only include substantial texts
-                    corpus_texts.append(content)
-        except Exception as e:
-            print(f"Error reading corpus file {file_path}: {e}")
-            continue
+    for file_path, content in zip(txt_files, contents):
+        if content is not None:
+            corpus_texts.append(content)
+            corpus_files.append(os.path.basename(file_path))
+    
+    logging.info(f"Loaded {len(corpus_texts)} corpus documents from {len(txt_files)} files")
+    return corpus_texts, corpus_files
+
+def _read_corpus_file(file_path: str) -> Optional[str]:
+    """Read one corpus file, or return None if it is unreadable or too short to use."""
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read().strip()
+    except Exception as e:
+        logging.error(f"Error reading corpus file {file_path}: {e}")
+        return None
     
-    print(f"Loaded {len(corpus_texts)} corpus documents from {len(txt_files)} files")
-    return corpus_texts
+    if len(content) > 100:  # Only include substantial texts
+        return content
+    return None
 
 def add_to_corpus(text: str, filename: str) -> bool:
     """
@@ -193,8 +495,36 @@ def add_to_corpus(text: str, filename: str) -> bool:
         safe_filename = filename.replace(' ', '_').replace('.pdf', '.txt')
         file_path = os.path.join(corpus_dir, safe_filename)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(text)
+        with _corpus_lock:
+            cached = _corpus_cache.get(corpus_dir)
+            is_new_file = cached is not None and all(path != file_path for path, _, _ in cached["signature"])
+            
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            
+            # Append the new document to the cached corpus instead of making
+            # the next check re-read and re-hash every file. Overwritten files
+            # are left to the next check, which sees the change and reloads.
+            if is_new_file:
+                stat = os.stat(file_path)
+                signature = tuple(sorted(cached["signature"] + ((file_path, stat.st_mtime_ns, stat.st_size),)))
+                content = _read_corpus_file(file_path)
+                corpus_files, corpus_index, simhashes = cached["files"], cached["index"], cached["simhashes"]
+                if content is not None:
+                    row = _log_tf(_HASHER.transform([content.lower()]))
+                    simhash = _simhashes(row)
+                    if CORPUS_DUPLICATE_DISTANCE >= 0 and _is_duplicate(int(simhash[0]), simhashes.tolist()):
+                        logging.info(f"Not adding {safe_filename} to the cached corpus: near-duplicate of a corpus document")
+                    else:
+                        corpus_files = corpus_files + [os.path.basename(file_path)]
+                        corpus_index = _index_corpus(row if corpus_index is None else vstack([corpus_index["tf"], row], format='csr'))
+                        simhashes = np.concatenate([simhashes, simhash])
+                _corpus_cache[corpus_dir] = {
+                    "signature": signature,
+                    "files": corpus_files,
+                    "index": corpus_index,
+                    "simhashes": simhashes
+                }
         
         return True
         
@@ -1,11 +1,35 @@
 import re
 import logging
 import os
+import threading
+import numpy as np
 from flask import current_app
+from sklearn.feature_extraction.text import TfidfVectorizer
+from src.services.cache import cache_get, cache_set, get_or_set, make_key
+
+# Distilled BART: close to bart-large-cnn's summaries at about twice the speed
+DEFAULT_MODEL_NAME = 'sshleifer/distilbart-cnn-12-6'
+
+# (min_length, max_length) in tokens of each chunk's summary, and of the
+# re-summarized combination when the chunk summaries run long
+CHUNK_SUMMARY_LENGTH = (50, 150)
+COMBINED_SUMMARY_LENGTH = (100, 200)
 
 # Global model cache to prevent reloading models on each request
 _model_cache = {}
 
+# Guards model loading when several requests/workers summarize at once
+_model_lock = threading.Lock()
+
+# Heuristic summarizer: sentence boundaries, and keywords that indicate
+# important sentences
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+_IMPORTANT_KEYWORDS = (
+    'study', 'result', 'method', 'conclude', 'finding', 'research',
+    'analysis', 'experiment', 'data', 'significant', 'demonstrate',
+    'propose', 'novel', 'approach', 'framework', 'model', 'algorithm'
+)
+
 def summarize_text(text: str) -> str:
     """
     Summarize text using HuggingFace transformers BART model.
@@ -53,27 +77,59 @@ def summarize(text: str, use_hf: bool = True) -> str:
 
 def _get_summarizer():
     """Get or create cached HuggingFace summarizer."""
-    if 'summarizer' not in _model_cache:
+    if 'summarizer' in _model_cache:
+        return _model_cache['summarizer']
+    
+    with _model_lock:
+        if 'summarizer' in _model_cache:  # Loaded while we were waiting
+            return _model_cache['summarizer']
+        
         try:
+            import torch
             from transformers import pipeline
             
             # Get model configuration from Flask config
-            model_name = current_app.config.get('HF_MODEL_NAME', 'facebook/bart-large-cnn')
+            model_name = current_app.config.get('HF_MODEL_NAME', DEFAULT_MODEL_NAME)
             cache_dir = current_app.config.get('HF_CACHE_DIR', './models_cache')
+            quantize_cpu = current_app.config.get('HF_QUANTIZE_CPU', True)
+            use_onnx = current_app.config.get('HF_USE_ONNX', False)
             
             # Ensure cache directory exists
             os.makedirs(cache_dir, exist_ok=True)
             
-            logging.info(f"Loading HuggingFace model: {model_name}")
+            # Half precision on GPU halves weight bandwidth and uses tensor cores
+            use_cuda = torch.cuda.is_available()
             
-            # Initialize summarizer with caching
-            _model_cache['summarizer'] = pipeline(
-                "summarization",
-                model=model_name,
-                cache_dir=cache_dir,
-                device=-1,  # Use CPU (-1) or 0 for GPU
-                framework="pt"  # PyTorch
-            )
+            summarizer = None
+            if use_onnx and not use_cuda:
+                try:
+                    summarizer = _load_onnx_summarizer(model_name, cache_dir)
+                    logging.info(f"Loaded HuggingFace model: {model_name} (onnxruntime/int8)")
+                except ImportError as e:
+                    logging.warning(f"ONNX Runtime summarizer unavailable, using PyTorch: {e}")
+            
+            if summarizer is None:
+                logging.info(f"Loading HuggingFace model: {model_name} ({'cuda/fp16' if use_cuda else 'cpu'})")
+                
+                # Initialize summarizer with caching
+                summarizer = pipeline(
+                    "summarization",
+                    model=model_name,
+                    cache_dir=cache_dir,
+                    device=0 if use_cuda else -1,  # Use CPU (-1) or 0 for GPU
+                    torch_dtype=torch.float16 if use_cuda else torch.float32,
+                    framework="pt"  # PyTorch
+                )
+                
+                # On CPU, int8 dynamic quantization of the Linear layers roughly
+                # halves the weight bytes moved per decode step
+                if not use_cuda and quantize_cpu:
+                    summarizer.model = torch.quantization.quantize_dynamic(
+                        summarizer.model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                    logging.info("Applied int8 dynamic quantization to summarizer")
+            
+            _model_cache['summarizer'] = summarizer
             
             logging.info("HuggingFace summarizer loaded successfully")
             
@@ -84,59 +140,128 @@ def _get_summarizer():
     
     return _model_cache['summarizer']
 
+def _load_onnx_summarizer(model_name: str, cache_dir: str):
+    """
+    Build a summarization pipeline that runs an int8 ONNX export of the model.
+    
+    The model is exported to ONNX and its weights quantized to int8 once, into
+    cache_dir; later loads read the quantized files directly.
+    
+    Args:
+        model_name: HuggingFace model to export
+        cache_dir: Directory for downloaded and exported models
+        
+    Returns:
+        HuggingFace summarization pipeline backed by ONNX Runtime
+        
+    Raises:
+        ImportError: If optimum[onnxruntime] is not installed
+    """
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer, pipeline
+    
+    model_dir = os.path.join(cache_dir, 'onnx-int8', model_name.replace('/', '--'))
+    onnx_files = ("encoder_model.onnx", "decoder_model.onnx", "decoder_with_past_model.onnx")
+    
+    if not os.path.exists(os.path.join(model_dir, "encoder_model_quantized.onnx")):
+        export_dir = model_dir + '-fp32'
+        model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, cache_dir=cache_dir)
+        model.save_pretrained(export_dir)
+        
+        # Dynamic quantization: int8 weights, activations quantized on the fly
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        for file_name in onnx_files:
+            if os.path.exists(os.path.join(export_dir, file_name)):
+                quantizer = ORTQuantizer.from_pretrained(export_dir, file_name=file_name)
+                quantizer.quantize(save_dir=model_dir, quantization_config=qconfig)
+        
+        model.config.save_pretrained(model_dir)
+        model.generation_config.save_pretrained(model_dir)
+        AutoTokenizer.from_pretrained(model_name, cache_dir=cache_dir).save_pretrained(model_dir)
+    
+    model = ORTModelForSeq2SeqLM.from_pretrained(
+        model_dir,
+        encoder_file_name="encoder_model_quantized.onnx",
+        decoder_file_name="decoder_model_quantized.onnx",
+        decoder_with_past_file_name="decoder_with_past_model_quantized.onnx"
+    )
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    
+    return pipeline("summarization", model=model, tokenizer=tokenizer)
+
 def _summarize_with_hf(text: str) -> str:
-    """Summarize using HuggingFace BART model."""
+    """Summarize using HuggingFace BART model, reusing results for identical documents."""
+    text = text.strip()
+    if len(text) < 100:
+        return text
+    
+    # Short documents don't need the model: an extractive summary is close
+    # in quality and takes milliseconds instead of seconds
+    max_words = current_app.config.get('HF_EXTRACTIVE_MAX_WORDS', 800)
+    if max_words > 0 and len(text.split(maxsplit=max_words)) < max_words:
+        try:
+            return _summarize_textrank(text)
+        except Exception as e:
+            logging.warning(f"TextRank summarization failed, falling back to heuristic: {e}")
+            return _summarize_heuristic(text)
+    
+    # Re-uploads of the same document skip the model (and loading it) entirely
+    return get_or_set("summary_doc", make_key(*_summary_settings(), text), lambda: _run_hf_summarizer(text))
+
+def _summary_settings() -> tuple:
+    """Model and generation settings a cached summary depends on (cache key parts)."""
+    config = current_app.config
+    return (
+        config.get('HF_MODEL_NAME', DEFAULT_MODEL_NAME),
+        config.get('HF_QUANTIZE_CPU', True),
+        config.get('HF_USE_ONNX', False),
+        config.get('HF_NUM_BEAMS', 2),
+        CHUNK_SUMMARY_LENGTH,
+        COMBINED_SUMMARY_LENGTH
+    )
+
+def _run_hf_summarizer(text: str) -> str:
+    """Run the HuggingFace BART model over the document, chunk by chunk."""
     try:
         summarizer = _get_summarizer()
         
-        # Clean and prepare text
-        text = text.strip()
-        if len(text) < 100:
-            return text
+        settings = _summary_settings()
+        num_beams = current_app.config.get('HF_NUM_BEAMS', 2)
+        batch_size = current_app.config.get('HF_BATCH_SIZE', 4)
         
-        # Chunk text to fit model limits (~1024 tokens ≈ 1200-1600 chars)
-        chunk_size = 1000  # Conservative chunk size
-        chunks = []
+        # Chunk text to fit the model's input window, measured in tokens
+        tokenizer = summarizer.tokenizer
+        max_tokens = min(tokenizer.model_max_length, 1024) - 2  # Leave room for <s> and </s>
+        chunks = _chunk_by_tokens(text, tokenizer, max_tokens)
         
-        # Split into chunks, preserving sentence boundaries
-        if len(text) <= chunk_size:
-            chunks = [text]
-        else:
-            # Split by paragraphs first
-            paragraphs = text.split('\n\n')
-            current_chunk = ""
-            
-            for paragraph in paragraphs:
-                if len(current_chunk) + len(paragraph) <= chunk_size:
-                    current_chunk += paragraph + "\n\n"
-                else:
-                    if current_chunk:
-                        chunks.append(current_chunk.strip())
-                    current_chunk = paragraph + "\n\n"
-            
-            if current_chunk:
-                chunks.append(current_chunk.strip())
+        # Reuse summaries of chunks seen before
+        chunks = [chunk for chunk in chunks if len(chunk.strip()) >= 50]  # Skip very short chunks
+        keys = [make_key(*settings, chunk) for chunk in chunks]
+        summaries = [cache_get("summary", key) for key in keys]
         
-        # Summarize each chunk
-        summaries = []
-        for chunk in chunks:
-            if len(chunk.strip()) < 50:  # Skip very short chunks
-                continue
-                
+        # Summarize the remaining chunks in batches rather than one call per chunk
+        missing = [i for i, summary in enumerate(summaries) if summary is None]
+        if missing:
             try:
-                summary = summarizer(
-                    chunk,
-                    max_length=150,  # Shorter summaries per chunk
-                    min_length=50,
+                outputs = summarizer(
+                    [chunks[i] for i in missing],
+                    batch_size=min(batch_size, len(missing)),
+                    min_length=CHUNK_SUMMARY_LENGTH[0],  # Shorter summaries per chunk
+                    max_length=CHUNK_SUMMARY_LENGTH[1],
                     do_sample=False,
+                    num_beams=num_beams,
                     truncation=True
-                )[0]['summary_text']
+                )
                 
-                summaries.append(summary.strip())
+                for i, output in zip(missing, outputs):
+                    summaries[i] = output['summary_text'].strip()
+                    cache_set("summary", keys[i], summaries[i])
                 
             except Exception as e:
-                logging.warning(f"Failed to summarize chunk: {e}")
-                continue
+                logging.warning(f"Failed to summarize chunks: {e}")
+        
+        summaries = [summary for summary in summaries if summary is not None]
         
         if not summaries:
             raise Exception("Failed to generate any summaries")
@@ -149,9 +274,10 @@ def _summarize_with_hf(text: str) -> str:
             try:
                 final_summary = summarizer(
                     final_summary,
-                    max_length=200,
-                    min_length=100,
+                    min_length=COMBINED_SUMMARY_LENGTH[0],
+                    max_length=COMBINED_SUMMARY_LENGTH[1],
                     do_sample=False,
+                    num_beams=num_beams,
                     truncation=True
                 )[0]['summary_text']
             except Exception as e:
@@ -166,56 +292,139 @@ def _summarize_with_hf(text: str) -> str:
         logging.error(f"HuggingFace summarization error: {e}")
         raise Exception(f"HuggingFace summarization error: {str(e)}")
 
-def _summarize_heuristic(text: str) -> str:
-    """Fallback heuristic summarization."""
-    sentences = _split_into_sentences(text)
+def _chunk_by_tokens(text: str, tokenizer, max_tokens: int) -> list[str]:
+    """
+    Split text into chunks of at most max_tokens tokens.
     
-    # Keywords that indicate important sentences
-    important_keywords = [
-        'study', 'result', 'method', 'conclude', 'finding', 'research',
-        'analysis', 'experiment', 'data', 'significant', 'demonstrate',
-        'propose', 'novel', 'approach', 'framework', 'model', 'algorithm'
-    ]
+    Paragraphs are packed together whole; a paragraph longer than max_tokens
+    is cut at token boundaries rather than mid-word.
     
-    # Score sentences
-    sentence_scores = []
-    for sentence in sentences:
-        if len(sentence.split()) < 5:  # Skip very short sentences
-            continue
-            
-        score = 0
-        sentence_lower = sentence.lower()
+    Args:
+        text: Text to split
+        tokenizer: Tokenizer of the summarization model
+        max_tokens: Maximum number of tokens per chunk
         
-        # Length bonus (prefer medium-length sentences)
-        word_count = len(sentence.split())
-        if 15 <= word_count <= 30:
-            score += 2
-        elif 10 <= word_count <= 40:
-            score += 1
+    Returns:
+        List of text chunks
+    """
+    paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+    paragraph_ids = tokenizer(paragraphs, add_special_tokens=False)['input_ids']
+    
+    chunks = []
+    current_chunk = []
+    current_tokens = 0
+    
+    for paragraph, ids in zip(paragraphs, paragraph_ids):
+        # Start a new chunk if this paragraph doesn't fit in the current one
+        if current_chunk and current_tokens + len(ids) > max_tokens:
+            chunks.append('\n\n'.join(current_chunk))
+            current_chunk = []
+            current_tokens = 0
         
-        # Keyword bonus
-        for keyword in important_keywords:
-            if keyword in sentence_lower:
-                score += 1
+        if len(ids) > max_tokens:
+            for start in range(0, len(ids), max_tokens):
+                window = ids[start:start + max_tokens]
+                chunks.append(tokenizer.decode(window, skip_special_tokens=True).strip())
+            continue
         
-        # Position bonus (first and last paragraphs are often important)
-        sentence_index = sentences.index(sentence)
-        if sentence_index < len(sentences) * 0.2:  # First 20%
-            score += 1
-        elif sentence_index > len(sentences) * 0.8:  # Last 20%
-            score += 1
+        current_chunk.append(paragraph)
+        current_tokens += len(ids)
+    
+    if current_chunk:
+        chunks.append('\n\n'.join(current_chunk))
+    
+    return chunks
+
+def _summarize_heuristic(text: str) -> str:
+    """Fallback heuristic summarization."""
+    sentences = _split_into_sentences(text)
+    if not sentences:
+        return ''
+    
+    # Score all sentences at once
+    word_counts = np.array([len(sentence.split()) for sentence in sentences])
+    
+    # Length bonus (prefer medium-length sentences)
+    scores = np.where((word_counts >= 15) & (word_counts <= 30), 2,
+                      np.where((word_counts >= 10) & (word_counts <= 40), 1, 0))
+    
+    # Keyword bonus
+    scores += _keyword_counts([sentence.lower() for sentence in sentences])
+    
+    # Position bonus (first and last paragraphs are often important), by
+    # each sentence's first occurrence
+    first_index = {}
+    for index, sentence in enumerate(sentences):
+        first_index.setdefault(sentence, index)
+    positions = np.array([first_index[sentence] for sentence in sentences])
+    scores += (positions < len(sentences) * 0.2) | (positions > len(sentences) * 0.8)
+    
+    return _select_sentences(sentences, word_counts, scores)
+
+def _summarize_textrank(text: str, damping: float = 0.85) -> str:
+    """
+    Extractive summarization with TextRank.
+    
+    Sentences are linked by the cosine similarity of their TF-IDF vectors and
+    ranked with PageRank, so sentences that share the most content with the
+    rest of the document are kept.
+    
+    Args:
+        text: Input text to summarize
+        damping: PageRank damping factor
         
-        sentence_scores.append((sentence, score))
+    Returns:
+        Summary built from the top-ranked sentences, in document order
+    """
+    sentences = _split_into_sentences(text)
+    if not sentences:
+        return ''
     
-    # Sort by score and select top sentences
-    sentence_scores.sort(key=lambda x: x[1], reverse=True)
+    # TF-IDF rows are L2-normalized, so their dot products are cosine similarities
+    tfidf = TfidfVectorizer(stop_words='english').fit_transform(sentences)
+    similarity = (tfidf @ tfidf.T).toarray()
+    np.fill_diagonal(similarity, 0)
+    
+    # Row-normalize into transition probabilities; a sentence sharing no
+    # words with any other links to every sentence equally
+    n = len(sentences)
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(similarity, row_sums, out=np.full_like(similarity, 1 / n), where=row_sums > 0)
+    
+    # PageRank by power iteration
+    ranks = np.full(n, 1 / n)
+    for _ in range(100):
+        new_ranks = (1 - damping) / n + damping * (transition.T @ ranks)
+        converged = np.abs(new_ranks - ranks).sum() < 1e-6
+        ranks = new_ranks
+        if converged:
+            break
+    
+    word_counts = np.array([len(sentence.split()) for sentence in sentences])
+    return _select_sentences(sentences, word_counts, ranks)
+
+def _select_sentences(sentences: list[str], word_counts: np.ndarray, scores: np.ndarray) -> str:
+    """
+    Build a summary of about 200 words from the highest-scoring sentences.
+    
+    Args:
+        sentences: Sentences of the document, in order
+        word_counts: Number of words in each sentence
+        scores: Score of each sentence (higher is more important)
+        
+    Returns:
+        Selected sentences joined in document order
+    """
+    # Sort by score (ties keep document order), skipping very short sentences
+    candidates = np.flatnonzero(word_counts >= 5)
+    ranked = [sentences[i] for i in candidates[np.argsort(-scores[candidates], kind='stable')]]
     
     # Select top 5-7 sentences, ensuring we don't exceed ~200 words
     selected_sentences = []
     total_words = 0
     target_words = 200
     
-    for sentence, score in sentence_scores:
+    for sentence in ranked:
         sentence_words = len(sentence.split())
         if total_words + sentence_words <= target_words:
             selected_sentences.append(sentence)
@@ -225,17 +434,15 @@ def _summarize_heuristic(text: str) -> str:
     
     # If we don't have enough, add more sentences
     if len(selected_sentences) < 3:
-        for sentence, score in sentence_scores:
+        for sentence in ranked:
             if sentence not in selected_sentences:
                 selected_sentences.append(sentence)
                 if len(selected_sentences) >= 5:
                     break
     
     # Order sentences by their original appearance
-    ordered_summary = []
-    for sentence in sentences:
-        if sentence in selected_sentences:
-            ordered_summary.append(sentence)
+    selected = set(selected_sentences)
+    ordered_summary = [sentence for sentence in sentences if sentence in selected]
     
     summary = ' '.join(ordered_summary)
     
@@ -245,10 +452,40 @@ def _summarize_heuristic(text: str) -> str:
     
     return summary.strip()
 
+def _keyword_counts(sentences_lower: list[str]) -> np.ndarray:
+    """
+    Count how many of the important keywords occur in each sentence.
+    
+    Each keyword is searched for once over all sentences joined together
+    (keywords never contain a newline, so a match cannot span two sentences)
+    instead of once per sentence.
+    
+    Args:
+        sentences_lower: Lowercased sentences
+        
+    Returns:
+        1-D array with the number of distinct keywords found in each sentence
+    """
+    joined = '\n'.join(sentences_lower)
+    starts = np.cumsum([0] + [len(sentence) + 1 for sentence in sentences_lower[:-1]])
+    
+    counts = np.zeros(len(sentences_lower), dtype=int)
+    for keyword in _IMPORTANT_KEYWORDS:
+        # Match offsets follow from the lengths of the text between matches
+        pieces = joined.split(keyword)
+        if len(pieces) == 1:
+            continue
+        lengths = np.fromiter(map(len, pieces), dtype=int, count=len(pieces))[:-1] + len(keyword)
+        matches = np.cumsum(lengths) - len(keyword)
+        # Buffered fancy-index add: a sentence with several matches counts once
+        counts[np.searchsorted(starts, matches, side='right') - 1] += 1
+    
+    return counts
+
 def _split_into_sentences(text: str) -> list[str]:
     """Split text into sentences using regex."""
     # Simple sentence splitting on periods, exclamation marks, question marks
-    sentences = re.split(r'[.!?]+', text)
+    sentences = _SENTENCE_SPLIT_RE.split(text)
     
     # Clean up sentences
     cleaned_sentences = []
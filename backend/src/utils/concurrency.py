@@ -0,0 +1,60 @@
+import threading
+import time
+from concurrent.futures import Executor, Future
+from flask import current_app
+
+def submit_with_app_context(executor: Executor, fn, *args, **kwargs) -> Future:
+    """
+    Submit a callable to an executor, running it inside the current app context.
+    
+    Services read settings from current_app.config, which is only bound on
+    the thread handling the request, so worker threads push their own context.
+    
+    Args:
+        executor: Executor to run the callable on
+        fn: Callable to run
+        *args, **kwargs: Arguments passed to fn
+        
+    Returns:
+        Future for the callable's result
+    """
+    app = current_app._get_current_object()
+    
+    def run():
+        with app.app_context():
+            return fn(*args, **kwargs)
+    
+    return executor.submit(run)
+
+
+class RateLimiter:
+    """
+    Token bucket shared by threads: lets through bursts of up to `burst`
+    calls, and `rate` calls per second on average after that.
+    
+    A rate of 0 or less disables limiting.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1):
+        self._rate = rate
+        self._burst = max(1, burst)
+        self._tokens = float(self._burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until the caller may make one call."""
+        if self._rate <= 0:
+            return
+        
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            # Take the token now (possibly going into debt) so callers queue
+            # up in order instead of racing for the next refill
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,35 @@
+def format_citations(citations) -> list:
+    """
+    Format citation validation results for the frontend.
+    
+    Args:
+        citations: Citation dicts with raw, cleaned_title and status fields
+        
+    Returns:
+        List of {"reference", "valid"} dicts
+    """
+    return [
+        {
+            "reference": citation.get('raw', citation.get('cleaned_title', 'Unknown citation')),
+            "valid": citation.get('status') == 'Valid'
+        }
+        for citation in citations
+    ]
+
+def format_facts(facts) -> list:
+    """
+    Format fact-check results for the frontend.
+    
+    Args:
+        facts: Fact-check dicts with claim and status fields
+        
+    Returns:
+        List of {"claim", "status"} dicts
+    """
+    return [
+        {
+            "claim": fact.get('claim', 'Unknown claim'),
+            "status": "Verified" if fact.get('status') == 'verified' else "Unverified"
+        }
+        for fact in facts
+    ]
@@ -0,0 +1,47 @@
+import json
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the standard library
+    orjson = None
+
+def dumps(value) -> str:
+    """Serialize a value to a JSON string (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+    return json.dumps(value)
+
+def loads(data):
+    """Deserialize a JSON string or bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes/decodes with orjson."""
+    
+    def _encode(self, obj, **kwargs) -> bytes:
+        # Scores computed with scikit-learn/numpy can be numpy scalars
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):  # Pretty-printed responses in debug mode
+            option |= orjson.OPT_INDENT_2
+        
+        # Types orjson doesn't know natively go through Flask's default hook
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option)
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return self._encode(obj, **kwargs).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Same as Flask's, but the body stays bytes instead of being decoded
+        # to str and re-encoded, which matters for large analysis payloads
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        
+        return self._app.response_class(self._encode(obj, indent=indent) + b"\n", mimetype=self.mimetype)
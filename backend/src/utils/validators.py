@@ -2,6 +2,9 @@ import os
 from flask import current_app
 from werkzeug.utils import secure_filename
 
+# Copy uploads to disk in 1 MiB chunks (Werkzeug's default is 16 KiB)
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+
 def allowed_file(filename):
     """Check if file has allowed extension."""
     allowed_ext = current_app.config.get('ALLOWED_EXT', '.pdf')